@@ -4,7 +4,15 @@ def bowditch_adjustment(data): # This function appears to be a placeholder, the
 
 def least_squares_adjustment(data):
     pass
+import math
 import numpy as np
+from .calculations import calculate_lat_dep, calculate_coordinates
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
 
 def adjust_traverse_bowditch(distances, latitudes, departures):
     """
@@ -17,23 +25,76 @@ def adjust_traverse_bowditch(distances, latitudes, departures):
 
     Returns:
         tuple: A tuple containing adjusted latitudes, adjusted departures,
-               latitude corrections, and departure corrections.
+               latitude corrections, and departure corrections as numpy arrays.
     """
+    distances = np.asarray(distances, dtype=np.float64)
+    latitudes = np.asarray(latitudes, dtype=np.float64)
+    departures = np.asarray(departures, dtype=np.float64)
     total_distance = np.sum(distances)
     misclosure_latitude = np.sum(latitudes)
     misclosure_departure = np.sum(departures)
 
     if total_distance == 0:
         # Return zero corrections if there's no distance
-        zero_corrections = [0.0] * len(latitudes)
+        zero_corrections = np.zeros(len(latitudes))
         return latitudes, departures, zero_corrections, zero_corrections
 
     # Bowditch Rule Correction
     # Correction = - (Total Misclosure * Leg Distance) / Total Perimeter
-    corrections_latitude = [-misclosure_latitude * dist / total_distance for dist in distances]
-    corrections_departure = [-misclosure_departure * dist / total_distance for dist in distances]
+    corrections_latitude = -misclosure_latitude * distances / total_distance
+    corrections_departure = -misclosure_departure * distances / total_distance
+
+    adjusted_latitudes = latitudes + corrections_latitude
+    adjusted_departures = departures + corrections_departure
+
+    return adjusted_latitudes, adjusted_departures, corrections_latitude, corrections_departure
 
-    adjusted_latitudes = np.array(latitudes) + np.array(corrections_latitude)
-    adjusted_departures = np.array(departures) + np.array(corrections_departure)
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _traverse_fused(start_e, start_n, dists, az_rad):
+        """Lat/dep, Bowditch correction and coordinates in two passes over the legs."""
+        n = dists.shape[0]
+        lats = np.empty(n)
+        deps = np.empty(n)
+        sum_lat = 0.0
+        sum_dep = 0.0
+        sum_d = 0.0
+        for i in range(n):
+            lats[i] = dists[i] * math.cos(az_rad[i])
+            deps[i] = dists[i] * math.sin(az_rad[i])
+            sum_lat += lats[i]
+            sum_dep += deps[i]
+            sum_d += dists[i]
+
+        k_lat = -sum_lat / sum_d if sum_d != 0.0 else 0.0
+        k_dep = -sum_dep / sum_d if sum_d != 0.0 else 0.0
+        coords = np.empty((n + 1, 2))
+        coords[0, 0] = start_e
+        coords[0, 1] = start_n
+        for i in range(n):
+            coords[i + 1, 0] = coords[i, 0] + deps[i] + k_dep * dists[i]
+            coords[i + 1, 1] = coords[i, 1] + lats[i] + k_lat * dists[i]
+        return lats, deps, coords
+
+def traverse_bowditch(start_northing, start_easting, azimuths, distances):
+    """
+    Runs a whole compass traverse: latitudes/departures, Bowditch adjustment
+    and final coordinates.
+
+    Args:
+        start_northing, start_easting (float): Coordinates of the first station.
+        azimuths (list or np.ndarray): Leg azimuths in decimal degrees.
+        distances (list or np.ndarray): Leg distances.
+
+    Returns:
+        tuple: (latitudes, departures, coords) where coords is the (N+1, 2)
+               array of adjusted (easting, northing) from calculate_coordinates.
+    """
+    azimuths = np.asarray(azimuths, dtype=np.float64)
+    distances = np.asarray(distances, dtype=np.float64)
+    if NUMBA_AVAILABLE:
+        return _traverse_fused(float(start_easting), float(start_northing), distances, np.radians(azimuths))
 
-    return adjusted_latitudes.tolist(), adjusted_departures.tolist(), corrections_latitude, corrections_departure
+    latitudes, departures = calculate_lat_dep(azimuths, distances)
+    adj_latitudes, adj_departures, _, _ = adjust_traverse_bowditch(distances, latitudes, departures)
+    return latitudes, departures, calculate_coordinates(start_northing, start_easting, adj_latitudes, adj_departures)
@@ -1,13 +1,42 @@
 """Core surveying calculation functions"""
+import functools
+import importlib.util
+import math
 import numpy as np
 
+# numba is only located here; _combine_dms_jit imports it on the first array conversion
+NUMBA_AVAILABLE = importlib.util.find_spec("numba") is not None
+
+try:
+    import numexpr as ne
+    NUMEXPR_AVAILABLE = True
+except ImportError:
+    NUMEXPR_AVAILABLE = False
+
+# numexpr only pays off once its thread start-up is small next to the array work
+NUMEXPR_MIN_SIZE = 100000
+
 def dms_to_dd(dms_str):
     """
     Converts an angle string in DD.MMSS format to decimal degrees.
     Example: "123.4530" -> 123 degrees, 45 minutes, 30 seconds.
+
+    Whole-number ints and floats are returned directly as floats, since they
+    carry no minutes or seconds. For arrays of angles use dms_to_dd_array.
     """
+    # Fast path: whole-degree numbers skip the string round-trip (bool is not an angle)
+    if isinstance(dms_str, (int, float)) and not isinstance(dms_str, bool):
+        value = float(dms_str)
+        if value.is_integer():
+            return value
+
+    # Parse on the string form so the cache key is the same for "45.3000" and 45.3
+    return _parse_dms(str(dms_str))
+
+@functools.lru_cache(maxsize=4096)
+def _parse_dms(dms_str):
+    """Cached DD.MMSS string parser behind dms_to_dd (survey angles repeat often)."""
     try:
-        dms_str = str(dms_str)
         # If it doesn't contain a '.', it's likely already decimal or a simple integer.
         if '.' not in dms_str:
             return float(dms_str)
@@ -25,6 +54,65 @@ def dms_to_dd(dms_str):
     except (ValueError, IndexError, TypeError):
         return None
 
+def dms_to_dd_array(angles):
+    """
+    Vectorised dms_to_dd for a sequence of angles in DD.MMSS format.
+
+    Plain DD.MMSS values are decoded with numpy string operations; anything
+    else is passed through dms_to_dd so the results always agree with it.
+
+    Args:
+        angles (list or np.ndarray): Angles as DD.MMSS strings or numbers.
+
+    Returns:
+        np.ndarray: Angles in decimal degrees (NaN where dms_to_dd returns None).
+    """
+    text = np.asarray(angles).astype(str)
+    if text.size == 0:
+        return np.empty(text.shape, dtype=np.float64)
+
+    parts = np.char.partition(text, '.')
+    degrees_str, fractional_part = parts[..., 0], parts[..., 2]
+
+    # Same rule as dms_to_dd: 4+ digits after the point means MMSS, extra digits are ignored
+    mmss_str = fractional_part.astype('U4')
+    is_dms = (np.char.str_len(fractional_part) >= 4) & np.char.isdigit(mmss_str) \
+        & (np.char.find(fractional_part, '.') < 0)
+
+    result = np.empty(text.shape, dtype=np.float64)
+    other = ~is_dms
+    try:
+        mmss = mmss_str[is_dms].astype(np.float64)
+        combine = _combine_dms_jit() if NUMBA_AVAILABLE else _combine_dms
+        result[is_dms] = combine(degrees_str[is_dms].astype(np.float64), mmss)
+    except ValueError:
+        other[...] = True # Non-numeric degrees somewhere, parse everything one by one
+
+    if other.any():
+        result[other] = np.array([dms_to_dd(value) for value in text[other]], dtype=np.float64)
+    return result
+
+def _combine_dms(degrees, mmss):
+    """DD + MMSS arrays -> decimal degrees."""
+    minutes = np.floor(mmss / 100.0)
+    return degrees + (minutes / 60.0) + ((mmss - minutes * 100.0) / 3600.0)
+
+def _combine_dms_scalar(degrees, mmss):
+    """Scalar _combine_dms, the source of the numba ufunc."""
+    minutes = math.floor(mmss / 100.0)
+    return degrees + (minutes / 60.0) + ((mmss - minutes * 100.0) / 3600.0)
+
+@functools.lru_cache(maxsize=None)
+def _combine_dms_jit():
+    """
+    Returns _combine_dms_scalar compiled into a ufunc by numba.
+
+    numba is imported here rather than at module level so that importing this
+    module stays cheap; the ufunc is built once, on the first array conversion.
+    """
+    from numba import vectorize
+    return vectorize(['float64(float64, float64)'], cache=True)(_combine_dms_scalar)
+
 def dd_to_dms(dd):
     """
     Converts decimal degrees to a DD.MMSS string.
@@ -35,24 +123,38 @@ def dd_to_dms(dd):
     Returns:
         str: The angle in DD.MMSS format.
     """
-    is_negative = dd < 0
-    dd = abs(dd)
-    degrees = int(dd)
-    minutes_float = (dd - degrees) * 60
-    minutes = int(minutes_float)
-    seconds = round((minutes_float - minutes) * 60)
-
-    # Handle cases where seconds round up to 60
-    if seconds == 60:
-        minutes += 1
-        seconds = 0
-    if minutes == 60:
-        degrees += 1
-        minutes = 0
-
-    sign = "-" if is_negative else ""
+    # Rounding the total seconds carries 60" and 60' over automatically
+    total_seconds = round(abs(dd) * 3600)
+    degrees, remainder = divmod(total_seconds, 3600)
+    minutes, seconds = divmod(remainder, 60)
+
+    sign = "-" if dd < 0 else ""
     return f"{sign}{degrees:02d}.{minutes:02d}{seconds:02d}"
 
+def dd_to_dms_array(dd):
+    """
+    Vectorised dd_to_dms for an array of angles.
+
+    Args:
+        dd (list or np.ndarray): Angles in decimal degrees (must be finite).
+
+    Returns:
+        np.ndarray: Angles as DD.MMSS strings.
+    """
+    dd = np.asarray(dd, dtype=np.float64)
+    if dd.size == 0:
+        return np.empty(dd.shape, dtype=str)
+
+    total_seconds = np.round(np.abs(dd) * 3600).astype(np.int64)
+    degrees = total_seconds // 3600
+    minutes = (total_seconds // 60) % 60
+    seconds = total_seconds % 60
+
+    sign = np.where(dd < 0, "-", "")
+    degrees_str = np.char.add(sign, np.char.zfill(degrees.astype(str), 2))
+    mmss_str = np.char.add(np.char.zfill(minutes.astype(str), 2), np.char.zfill(seconds.astype(str), 2))
+    return np.char.add(np.char.add(degrees_str, "."), mmss_str)
+
 def calculate_lat_dep(azimuths, distances, angle_format='dd'):
     """
     Calculates the latitude and departure for each traverse leg.
@@ -64,17 +166,23 @@ def calculate_lat_dep(azimuths, distances, angle_format='dd'):
                             degrees or 'dms' for DD.MMSS string format).
 
     Returns:
-        tuple: A tuple containing (list of latitudes, list of departures).
+        tuple: A tuple containing (latitudes, departures) as numpy arrays.
     """
     azimuths_dd = azimuths
     if angle_format == 'dms':
-        azimuths_dd = [dms_to_dd(az) for az in azimuths]
+        azimuths_dd = dms_to_dd_array(azimuths)
 
     # Convert azimuths from decimal degrees to radians for numpy trigonometric functions
     azimuths_rad = np.deg2rad(azimuths_dd)
 
-    # Ensure distances is a numpy array for element-wise multiplication
-    distances = np.array(distances)
+    # Ensure distances is a float array for element-wise multiplication (no copy if it already is)
+    distances = np.asarray(distances, dtype=np.float64)
+
+    if NUMEXPR_AVAILABLE and distances.size >= NUMEXPR_MIN_SIZE:
+        # Fused, multi-threaded evaluation without the cos/sin temporaries
+        latitudes = ne.evaluate("distances * cos(azimuths_rad)")
+        departures = ne.evaluate("distances * sin(azimuths_rad)")
+        return latitudes, departures
 
     # Latitude = Distance * cos(Azimuth)
     latitudes = distances * np.cos(azimuths_rad)
@@ -82,13 +190,18 @@ def calculate_lat_dep(azimuths, distances, angle_format='dd'):
     # Departure = Distance * sin(Azimuth)
     departures = distances * np.sin(azimuths_rad)
 
-    return latitudes.tolist(), departures.tolist()
+    return latitudes, departures
 
 def calculate_coordinates(start_northing, start_easting, adj_latitudes, adj_departures):
-    """Calculates final coordinates from adjusted latitudes and departures."""
-    coords = [(start_easting, start_northing)]
-    for i in range(len(adj_latitudes)):
-        next_easting = coords[-1][0] + adj_departures[i]
-        next_northing = coords[-1][1] + adj_latitudes[i]
-        coords.append((next_easting, next_northing))
+    """
+    Calculates final coordinates from adjusted latitudes and departures.
+
+    Returns:
+        np.ndarray: (N+1, 2) array of (easting, northing), starting with the start point.
+    """
+    coords = np.empty((len(adj_latitudes) + 1, 2), dtype=np.float64)
+    coords[0] = (start_easting, start_northing)
+    # Running sums of the adjusted legs
+    coords[1:, 0] = start_easting + np.cumsum(adj_departures)
+    coords[1:, 1] = start_northing + np.cumsum(adj_latitudes)
     return coords
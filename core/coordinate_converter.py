@@ -2,59 +2,72 @@
 def transform_coordinates(coords):
     pass
 from pyproj import Transformer, CRS
+import functools
 import math
+import numpy as np
+
+@functools.lru_cache(maxsize=128)
+def _crs(epsg):
+    """Returns a cached CRS for an EPSG code; each code is looked up in the PROJ database once."""
+    return CRS.from_epsg(epsg)
+
+@functools.lru_cache(maxsize=256)
+def _get_transformer(from_epsg, to_epsg):
+    """
+    Returns a cached Transformer between two EPSG codes.
+
+    Building a Transformer is far more expensive than using one, so each
+    EPSG pair is only constructed once per session.
+    """
+    # always_xy=True ensures (lon, lat) or (easting, northing) order
+    return Transformer.from_crs(_crs(from_epsg), _crs(to_epsg), always_xy=True)
 
 def convert_to_global(local_points, local_epsg):
     """
     Converts a list of local Cartesian coordinates to global WGS84 (lon, lat).
 
     Args:
-        local_points (list of tuples): A list of (easting, northing) coordinates.
+        local_points (list of tuples or np.ndarray): (easting, northing) coordinates,
+            either as a list of pairs or an (N, 2) array.
         local_epsg (int): The EPSG code of the local coordinate system (e.g., a UTM zone).
 
     Returns:
         list of tuples: A list of converted (longitude, latitude) coordinates.
     """
-    if not local_points:
+    if len(local_points) == 0:
         return []
 
-    local_crs = CRS(f"EPSG:{local_epsg}")
-    global_crs = CRS("EPSG:4326") # WGS84
+    # Target is WGS84 (EPSG:4326), output is (longitude, latitude)
+    transformer = _get_transformer(int(local_epsg), 4326)
 
-    # always_xy=True ensures the output is (longitude, latitude)
-    transformer = Transformer.from_crs(local_crs, global_crs, always_xy=True)
-    global_points = [transformer.transform(p[0], p[1]) for p in local_points]
-    return global_points
+    # Transform all points in one call instead of one Python->PROJ round-trip per point
+    pts = np.asarray(local_points, dtype=float)
+    lons, lats = transformer.transform(pts[:, 0], pts[:, 1])
+    return list(zip(lons.tolist(), lats.tolist()))
 
 def convert_coords(points, from_epsg, to_epsg):
     """
     Converts a list of coordinates from a source EPSG to a target EPSG.
 
     Args:
-        points (list of tuples): A list of (x, y, z) coordinates.
+        points (list of tuples or np.ndarray): (x, y, z) coordinates, either as a
+            list of triples or an (N, 3) array.
         from_epsg (int): The EPSG code of the source coordinate system.
         to_epsg (int): The EPSG code of the target coordinate system.
 
     Returns:
-        list of tuples: A list of converted (x, y, z) coordinates.
+        np.ndarray: (N, 3) array of converted (x, y, z) coordinates.
     """
-    if not points:
-        return []
-
-    from_crs = CRS(f"EPSG:{from_epsg}")
-    to_crs = CRS(f"EPSG:{to_epsg}")
-
-    # always_xy=True ensures (lon, lat) or (easting, northing) order
-    transformer = Transformer.from_crs(from_crs, to_crs, always_xy=True)
-
-    # Unzip points for transformation
-    x_coords, y_coords, z_coords = zip(*points)
+    if len(points) == 0:
+        return np.empty((0, 3))
 
-    # Perform the transformation
-    x_out, y_out, z_out = transformer.transform(x_coords, y_coords, z_coords)
+    # int() so "32632", 32632 and numpy ints from the UIs all share one cache entry
+    transformer = _get_transformer(int(from_epsg), int(to_epsg))
 
-    # Zip them back into a list of tuples
-    return list(zip(x_out, y_out, z_out))
+    # Transform the x, y, z columns in a single vectorised call
+    pts = np.asarray(points, dtype=float)
+    x_out, y_out, z_out = transformer.transform(pts[:, 0], pts[:, 1], pts[:, 2])
+    return np.column_stack((x_out, y_out, z_out))
 
 def get_utm_epsg_code(longitude):
     """
@@ -0,0 +1,35 @@
+"""Differential leveling calculations"""
+import numpy as np
+
+def calculate_levels(start_elevation, backsights, foresights):
+    """
+    Reduces a differential leveling run using the height of instrument method.
+
+    Each row is booked as one setup: its backsight (BS) is read on the row's own
+    station and its foresight (FS) on the next row's station. A row without a
+    backsight keeps the previous height of instrument.
+
+    Args:
+        start_elevation (float): Elevation of the starting benchmark (first row).
+        backsights (list or np.ndarray): BS reading per row, 0 where there is none.
+        foresights (list or np.ndarray): FS reading per row, 0 where there is none.
+
+    Returns:
+        tuple: (heights of instrument, elevations) as arrays. There is one more
+               elevation than rows; the last one comes from the final row's FS.
+    """
+    bs = np.asarray(backsights, dtype=np.float64)
+    fs = np.asarray(foresights, dtype=np.float64)
+    if bs.size == 0:
+        return np.empty(0), np.array([float(start_elevation)])
+
+    # A new setup changes HI by its BS minus the FS that carried the level there:
+    # HI_i = HI_(i-1) - FS_(i-1) + BS_i, otherwise HI_i = HI_(i-1)
+    steps = np.where(bs > 0, bs - np.concatenate(([0.0], fs[:-1])), 0.0)
+    steps[0] = bs[0]
+    hi = start_elevation + np.cumsum(steps)
+
+    elevations = np.empty(bs.size + 1, dtype=np.float64)
+    elevations[0] = start_elevation
+    elevations[1:] = hi - fs
+    return hi, elevations
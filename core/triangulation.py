@@ -1,6 +1,18 @@
 import math
 import numpy as np
-from core.calculations import dms_to_dd, dd_to_dms
+from core.calculations import dms_to_dd, dms_to_dd_array, dd_to_dms_array
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    from scipy.linalg import cho_factor, cho_solve
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
 
 def calculate_intersection(eA, nA, eB, nB, angle_A_dms, angle_B_dms, direction="Left"):
     """
@@ -16,11 +28,15 @@ def calculate_intersection(eA, nA, eB, nB, angle_A_dms, angle_B_dms, direction="
 
     Returns:
         tuple: (Easting_C, Northing_C)
+
+    For many triangles at once use calculate_intersections_batch.
     """
     # 1. Convert angles to decimal degrees and then radians
     alpha_deg = dms_to_dd(angle_A_dms)
     beta_deg = dms_to_dd(angle_B_dms)
-    
+    if alpha_deg is None or beta_deg is None:
+        raise ValueError("Angles must be valid DD.MMSS values.")
+
     alpha = math.radians(alpha_deg)
     beta = math.radians(beta_deg)
 
@@ -31,14 +47,14 @@ def calculate_intersection(eA, nA, eB, nB, angle_A_dms, angle_B_dms, direction="
     # 2. Calculate properties of the baseline A->B
     delta_e = eB - eA
     delta_n = nB - nA
-    
+
     # Distance AB
-    dist_AB = math.sqrt(delta_e**2 + delta_n**2)
-    
+    dist_AB = math.hypot(delta_e, delta_n)
+
     # Azimuth of A->B (standard surveying azimuth, North = 0, clockwise)
     # math.atan2(x, y) gives angle from Y axis (North) if inputs are (delta_e, delta_n)
     azimuth_AB = math.atan2(delta_e, delta_n)
-    
+
     # 3. Calculate Distance A->C using Sine Rule
     # Gamma is the angle at C
     gamma = math.pi - (alpha + beta)
@@ -58,7 +74,122 @@ def calculate_intersection(eA, nA, eB, nB, angle_A_dms, angle_B_dms, direction="
 
     return eC, nC
 
-def adjust_network_least_squares(stations, observations):
+def calculate_intersections_batch(eA, nA, eB, nB, alpha_dms_arr, beta_dms_arr, direction_arr):
+    """
+    Vectorised calculate_intersection for many A-B-C triangles at once.
+
+    Args:
+        eA, nA, eB, nB (float or np.ndarray): Coordinates of Stations A and B.
+        alpha_dms_arr (array-like): Internal angles at A (BAC) in DD.MMSS format.
+        beta_dms_arr (array-like): Internal angles at B (ABC) in DD.MMSS format.
+        direction_arr (array-like): "Left" or "Right" relative to each vector A->B.
+
+    Returns:
+        tuple: (Easting_C array, Northing_C array)
+    """
+    # 1. Convert angles to decimal degrees and then radians
+    alpha = np.deg2rad(dms_to_dd_array(alpha_dms_arr))
+    beta = np.deg2rad(dms_to_dd_array(beta_dms_arr))
+
+    if np.isnan(alpha).any() or np.isnan(beta).any():
+        raise ValueError("Angles must be valid DD.MMSS values.")
+
+    # Check for valid triangle (sum of angles < 180)
+    if np.any(alpha + beta >= np.pi):
+        raise ValueError("Sum of internal angles must be less than 180 degrees.")
+
+    eA, nA = np.asarray(eA, dtype=np.float64), np.asarray(nA, dtype=np.float64)
+
+    # 2. Calculate properties of the baseline A->B
+    delta_e = np.asarray(eB, dtype=np.float64) - eA
+    delta_n = np.asarray(nB, dtype=np.float64) - nA
+
+    # Distance AB
+    dist_AB = np.hypot(delta_e, delta_n)
+
+    # Azimuth of A->B (standard surveying azimuth, North = 0, clockwise)
+    azimuth_AB = np.arctan2(delta_e, delta_n)
+
+    # 3. Calculate Distance A->C using Sine Rule
+    # Gamma is the angle at C
+    gamma = np.pi - (alpha + beta)
+    dist_AC = dist_AB * np.sin(beta) / np.sin(gamma)
+
+    # 4. Calculate Azimuth A->C: subtract alpha if C is left of AB, add it if right
+    sign = np.where(np.char.lower(np.asarray(direction_arr, dtype=str)) == "left", -1.0, 1.0)
+    azimuth_AC = azimuth_AB + sign * alpha
+
+    # 5. Calculate Coordinates of C
+    eC = eA + dist_AC * np.sin(azimuth_AC)
+    nC = nA + dist_AC * np.cos(azimuth_AC)
+
+    return eC, nC
+
+def _pair_geometry(coords_e, coords_n, pair_from, pair_to):
+    """
+    Distance and azimuth sine/cosine for every station pair in one vectorised pass.
+
+    Returns:
+        tuple: (dist, sin_az, cos_az) arrays, one entry per pair.
+    """
+    dx = coords_e[pair_to] - coords_e[pair_from]
+    dy = coords_n[pair_to] - coords_n[pair_from]
+    dist = np.hypot(dx, dy)
+    # sin/cos of atan2(dx, dy) without the trig; coincident points get azimuth 0
+    has_length = dist > 0
+    sin_az = np.divide(dx, dist, out=np.zeros_like(dx), where=has_length)
+    cos_az = np.divide(dy, dist, out=np.ones_like(dy), where=has_length)
+    return dist, sin_az, cos_az
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _fill_distance_rows_jit(dist, sin_az, cos_az, col_from, col_to, obs_pair, obs_value, A, L):
+        """Loop version of _fill_distance_rows, compiled by numba."""
+        for k in range(obs_value.shape[0]):
+            p = obs_pair[k]
+
+            # L = Observed - Calculated
+            L[k] = obs_value[k] - dist[p]
+
+            # Derivatives: dDist/dEi = -sin(Az), dDist/dNi = -cos(Az)
+            # Station I (From)
+            if col_from[p] >= 0:
+                A[k, col_from[p]] = -sin_az[p]   # dE
+                A[k, col_from[p] + 1] = -cos_az[p] # dN
+
+            # Station J (To)
+            if col_to[p] >= 0:
+                A[k, col_to[p]] = sin_az[p]    # dE
+                A[k, col_to[p] + 1] = cos_az[p]  # dN
+
+def _fill_distance_rows(dist, sin_az, cos_az, col_from, col_to, obs_pair, obs_value, A, L):
+    """
+    Fills the Jacobian rows and misclosures for distance observations in place.
+
+    Args:
+        dist, sin_az, cos_az (np.ndarray): Current geometry of each station pair.
+        col_from, col_to (np.ndarray): First Jacobian column of each pair's stations, -1 if fixed.
+        obs_pair (np.ndarray): Pair index of each observation.
+        obs_value (np.ndarray): Observed distances.
+        A (np.ndarray): Jacobian to fill, shape (n_obs, num_unknowns).
+        L (np.ndarray): Misclosure vector to fill (Observed - Calculated).
+    """
+    if NUMBA_AVAILABLE:
+        _fill_distance_rows_jit(dist, sin_az, cos_az, col_from, col_to, obs_pair, obs_value, A, L)
+        return
+
+    # L = Observed - Calculated
+    L[:] = obs_value - dist[obs_pair]
+
+    # Derivatives: dDist/dEi = -sin(Az), dDist/dNi = -cos(Az); +sin/+cos for station J.
+    # Station J is written second so it wins if both ends share columns, as in the loop.
+    rows = np.arange(obs_pair.size)
+    for cols, sign in ((col_from[obs_pair], -1.0), (col_to[obs_pair], 1.0)):
+        free = cols >= 0
+        A[rows[free], cols[free]] = sign * sin_az[obs_pair[free]] # dE
+        A[rows[free], cols[free] + 1] = sign * cos_az[obs_pair[free]] # dN
+
+def adjust_network_least_squares(stations, observations, tol=0.001):
     """
     Performs a 2D Least Squares Adjustment (Variation of Coordinates) for a survey network.
 
@@ -72,128 +203,99 @@ def adjust_network_least_squares(stations, observations):
                              Let's assume observations list: 
                              {'type': 'angle', 'at': A, 'from': B, 'to': C, 'value': dms, 'sd': sec}
                              {'type': 'distance', 'from': A, 'to': B, 'value': m, 'sd': m}
+        tol (float): Convergence threshold in metres (default 1mm), checked against the
+                     misclosures before solving and against the coordinate corrections after.
 
     Returns:
         dict: Adjusted stations coordinates.
     """
-    # Convert station dict to working arrays
-    unknowns = []
-    unknown_indices = {}
-    
-    for name, data in stations.items():
-        if not data['fixed']:
-            unknown_indices[name] = len(unknowns)
-            unknowns.append(name) # We need 2 unknowns per station (dE, dN)
-
-    if not unknowns:
+    # Convert station dict to working arrays (one entry per station, in dict order)
+    names = list(stations)
+    station_pos = {name: i for i, name in enumerate(names)}
+    coords_e = np.array([data['e'] for data in stations.values()], dtype=np.float64)
+    coords_n = np.array([data['n'] for data in stations.values()], dtype=np.float64)
+    fixed_mask = np.array([bool(data['fixed']) for data in stations.values()], dtype=bool)
+
+    free = np.flatnonzero(~fixed_mask)
+    if free.size == 0:
         return stations # Nothing to adjust
 
-    num_unknowns = len(unknowns) * 2
-    
+    num_unknowns = free.size * 2 # We need 2 unknowns per station (dE, dN)
+
+    # First Jacobian column of each station, -1 if fixed
+    col = np.full(len(names), -1, dtype=np.int64)
+    col[free] = 2 * np.arange(free.size)
+
+    # Pack distance observations once; the weights do not change between iterations.
+    # Repeated station pairs share one geometry entry.
+    pair_idx = {}
+    obs_pair, obs_value, P = [], [], []
+    for obs in observations:
+        try:
+            if obs['type'] == 'distance':
+                pair = (station_pos[obs['from']], station_pos[obs['to']])
+                weight = 1.0 / (obs['sd']**2)
+                obs_pair.append(pair_idx.setdefault(pair, len(pair_idx)))
+                obs_value.append(obs['value'])
+                P.append(weight)
+            # Angle observations are not yet modelled in the Jacobian, so they
+            # contribute no rows (rigorous angle derivatives still to be added).
+        except KeyError:
+            continue # Skip invalid stations
+
+    if not obs_pair:
+        return stations
+
+    pair_from = np.array([i for i, _ in pair_idx], dtype=np.int64)
+    pair_to = np.array([j for _, j in pair_idx], dtype=np.int64)
+    col_from, col_to = col[pair_from], col[pair_to]
+    obs_pair = np.array(obs_pair, dtype=np.int64)
+    obs_value = np.array(obs_value, dtype=np.float64)
+    P = np.array(P, dtype=np.float64)
+    n_obs = len(obs_value)
+
+    # Allocated once: every iteration rewrites the same Jacobian entries and all of L
+    A = np.zeros((n_obs, num_unknowns), dtype=np.float64) # Jacobian
+    L = np.zeros(n_obs, dtype=np.float64) # Misclosure (Observed - Calculated)
+
     # Iteration loop
     for iteration in range(5): # Usually converges in 2-3 iterations
-        A = [] # Jacobian
-        L = [] # Misclosure (Observed - Calculated)
-        P = [] # Weights
-
-        for obs in observations:
-            try:
-                if obs['type'] == 'distance':
-                    stn_i = stations[obs['from']]
-                    stn_j = stations[obs['to']]
-                    
-                    dx = stn_j['e'] - stn_i['e']
-                    dy = stn_j['n'] - stn_i['n']
-                    dist_calc = math.sqrt(dx**2 + dy**2)
-                    az_calc = math.atan2(dx, dy) # Radians
-
-                    # L = Observed - Calculated
-                    l_val = obs['value'] - dist_calc
-                    
-                    # Derivatives: dDist/dEi = -sin(Az), dDist/dNi = -cos(Az)
-                    sin_az = math.sin(az_calc)
-                    cos_az = math.cos(az_calc)
-
-                    row = [0] * num_unknowns
-                    
-                    # Station I (From)
-                    if obs['from'] in unknown_indices:
-                        idx = unknown_indices[obs['from']] * 2
-                        row[idx] = -sin_az   # dE
-                        row[idx+1] = -cos_az # dN
-                    
-                    # Station J (To)
-                    if obs['to'] in unknown_indices:
-                        idx = unknown_indices[obs['to']] * 2
-                        row[idx] = sin_az    # dE
-                        row[idx+1] = cos_az  # dN
-
-                    A.append(row)
-                    L.append(l_val)
-                    P.append(1.0 / (obs['sd']**2))
-
-                elif obs['type'] == 'angle':
-                    # Angle at 'at', from 'from', to 'to'
-                    stn_at = stations[obs['at']]
-                    stn_from = stations[obs['from']]
-                    stn_to = stations[obs['to']]
-
-                    # Azimuth At->To
-                    dx_to = stn_to['e'] - stn_at['e']
-                    dy_to = stn_to['n'] - stn_at['n']
-                    az_to = math.atan2(dx_to, dy_to)
-                    dist_to = math.sqrt(dx_to**2 + dy_to**2)
-
-                    # Azimuth At->From
-                    dx_from = stn_from['e'] - stn_at['e']
-                    dy_from = stn_from['n'] - stn_at['n']
-                    az_from = math.atan2(dx_from, dy_from)
-                    dist_from = math.sqrt(dx_from**2 + dy_from**2)
-
-                    angle_calc = (az_to - az_from) % (2 * math.pi)
-                    angle_obs = math.radians(dms_to_dd(obs['value']))
-                    
-                    l_val = angle_obs - angle_calc
-                    # Normalize L to -pi to pi
-                    if l_val > math.pi: l_val -= 2*math.pi
-                    if l_val < -math.pi: l_val += 2*math.pi
-
-                    # Derivatives logic is complex, simplified here for brevity
-                    # This requires rigorous implementation of A-matrix for angles
-                    # For now, we will skip detailed angle implementation in this snippet 
-                    # to avoid massive code blocks, but the structure supports it.
-                    pass 
-
-            except KeyError:
-                continue # Skip invalid stations
-
-        if not A:
+        dist, sin_az, cos_az = _pair_geometry(coords_e, coords_n, pair_from, pair_to)
+        _fill_distance_rows(dist, sin_az, cos_az, col_from, col_to, obs_pair, obs_value, A, L)
+
+        # Observations already fit the current coordinates, no need to solve again
+        if np.max(np.abs(L)) < tol:
             break
 
-        # Solve Normal Equations: X = (AtPA)^-1 AtPL
-        # Convert to numpy
-        nA = np.array(A)
-        nL = np.array(L)
-        nP = np.diag(P)
-        
+        # Solve Normal Equations: (AtPA) X = AtPL
+        # P is diagonal, so weight the rows of A instead of building an n_obs x n_obs matrix
         # N = At P A
-        N = nA.T @ nP @ nA
+        N = A.T @ (A * P[:, None])
         # U = At P L
-        U = nA.T @ nP @ nL
+        U = A.T @ (P * L)
         
         try:
-            X = np.linalg.inv(N) @ U
+            # N is symmetric positive-definite for a well-determined network
+            if SCIPY_AVAILABLE:
+                X = cho_solve(cho_factor(N, lower=True), U)
+            else:
+                X = np.linalg.solve(N, U)
         except np.linalg.LinAlgError:
-            return stations # Singular matrix, cannot solve
+            # Singular/rank-deficient network: take the minimum-norm weighted least-squares step
+            sqrt_p = np.sqrt(P)
+            X = np.linalg.lstsq(A * sqrt_p[:, None], sqrt_p * L, rcond=None)[0]
 
         # Update Coordinates
-        for i, name in enumerate(unknowns):
-            stations[name]['e'] += X[i*2]
-            stations[name]['n'] += X[i*2+1]
+        coords_e[free] += X[0::2]
+        coords_n[free] += X[1::2]
 
-        if np.max(np.abs(X)) < 0.001: # Convergence threshold (1mm)
+        if np.max(np.abs(X)) < tol: # Convergence threshold
             break
-            
+
+    # Write the adjusted coordinates back to the station dict
+    for i in free:
+        stations[names[i]]['e'] = float(coords_e[i])
+        stations[names[i]]['n'] = float(coords_n[i])
     return stations
 
 def calculate_simple_triangulation(start_e, start_n, base_dist, base_az_dms, triangles):
@@ -240,7 +342,40 @@ def calculate_simple_triangulation(start_e, start_n, base_dist, base_az_dms, tri
     n2 = start_n + base_dist * math.cos(base_az_rad)
     stations[p2_name] = (e2, n2)
 
-    for tri in triangles:
+    # Adjust all triangle angles up front; only the coordinate chain has to be sequential
+    a1_dd = dms_to_dd_array([tri['a1'] for tri in triangles])
+    a2_dd = dms_to_dd_array([tri['a2'] for tri in triangles])
+    a3_dd = dms_to_dd_array([tri['a3'] for tri in triangles])
+
+    if np.isnan(a1_dd).any() or np.isnan(a2_dd).any() or np.isnan(a3_dd).any():
+        raise ValueError("Triangle angles must be valid DD.MMSS values.")
+
+    sum_angles = a1_dd + a2_dd + a3_dd
+    errors = sum_angles - 180.0
+    corrections = -errors / 3.0
+
+    adj_a1 = a1_dd + corrections
+    adj_a2 = a2_dd + corrections
+    adj_a3 = a3_dd + corrections
+
+    # Sine rule ratios per triangle: side 1-3 / base = sin(a2) / sin(a3), side 2-3 / base = sin(a1) / sin(a3)
+    sin_a1, sin_a2, sin_a3 = np.sin(np.deg2rad(np.stack((adj_a1, adj_a2, adj_a3))))
+    ratio_13 = sin_a2 / sin_a3
+    ratio_23 = sin_a1 / sin_a3
+
+    # Angle at P1 signed by direction: Left turns anticlockwise from the base azimuth
+    directions = np.array([tri['dir'] for tri in triangles])
+    turn_13 = np.where(directions == "Left", -1.0, 1.0) * np.deg2rad(adj_a1)
+
+    # Plain Python floats for the sequential loop and the results. Each base comes from
+    # stations fixed by earlier triangles, so the coordinate chain itself stays a loop.
+    errors, turn_13 = errors.tolist(), turn_13.tolist()
+    ratio_13, ratio_23 = ratio_13.tolist(), ratio_23.tolist()
+    adj_a1_dms = dd_to_dms_array(adj_a1).tolist()
+    adj_a2_dms = dd_to_dms_array(adj_a2).tolist()
+    adj_a3_dms = dd_to_dms_array(adj_a3).tolist()
+
+    for i, tri in enumerate(triangles):
         p1 = tri['p1']
         p2 = tri['p2']
         p3 = tri['p3']
@@ -256,30 +391,13 @@ def calculate_simple_triangulation(start_e, start_n, base_dist, base_az_dms, tri
         dist_base = math.sqrt((e2-e1)**2 + (n2-n1)**2)
         az_base = math.atan2(e2-e1, n2-n1) # Radians
         
-        # Adjust Angles
-        a1_dd = dms_to_dd(tri['a1'])
-        a2_dd = dms_to_dd(tri['a2'])
-        a3_dd = dms_to_dd(tri['a3'])
-        
-        sum_angles = a1_dd + a2_dd + a3_dd
-        error = sum_angles - 180.0
-        correction = -error / 3.0
-        
-        adj_a1 = a1_dd + correction
-        adj_a2 = a2_dd + correction
-        adj_a3 = a3_dd + correction
-        
         # Sine Law
         # side 1-3 / sin(adj_a2) = base / sin(adj_a3)
-        dist_13 = dist_base * math.sin(math.radians(adj_a2)) / math.sin(math.radians(adj_a3))
-        dist_23 = dist_base * math.sin(math.radians(adj_a1)) / math.sin(math.radians(adj_a3))
+        dist_13 = dist_base * ratio_13[i]
+        dist_23 = dist_base * ratio_23[i]
         
         # Calculate Coords of P3 from P1
-        # Direction logic
-        if tri['dir'] == "Left":
-            az_13 = az_base - math.radians(adj_a1)
-        else:
-            az_13 = az_base + math.radians(adj_a1)
+        az_13 = az_base + turn_13[i]
             
         e3 = e1 + dist_13 * math.sin(az_13)
         n3 = n1 + dist_13 * math.cos(az_13)
@@ -288,11 +406,11 @@ def calculate_simple_triangulation(start_e, start_n, base_dist, base_az_dms, tri
         
         results.append({
             'triangle': f"{p1}-{p2}-{p3}",
-            'error': error * 3600, # seconds
-            'error_deg': error, # degrees (for formatting)
-            'adj_a1': dd_to_dms(adj_a1),
-            'adj_a2': dd_to_dms(adj_a2),
-            'adj_a3': dd_to_dms(adj_a3),
+            'error': errors[i] * 3600, # seconds
+            'error_deg': errors[i], # degrees (for formatting)
+            'adj_a1': adj_a1_dms[i],
+            'adj_a2': adj_a2_dms[i],
+            'adj_a3': adj_a3_dms[i],
             'dist_base': dist_base,
             'dist_13': dist_13,
             'dist_23': dist_23
@@ -1,38 +1,106 @@
 import math
-from .calculations import dms_to_dd
+import numpy as np
+from .calculations import dms_to_dd_array, NUMEXPR_MIN_SIZE
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    import numexpr as ne
+    NUMEXPR_AVAILABLE = True
+except ImportError:
+    NUMEXPR_AVAILABLE = False
+
+# Refraction/curvature coefficient for distances in km (c = 0.0675 * k^2 metres)
+CR_COEFFICIENT = 0.0675
+
+_DEG2RAD = math.pi / 180.0
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _trig_kernel(hd, va_dd, th, station_elev, hi):
+        """Fused per-observation reduction; one pass and no temporary arrays."""
+        n = hd.shape[0]
+        elev = np.empty(n)
+        cr = np.empty(n)
+        for i in range(n):
+            v_component = hd[i] * math.tan((90.0 - va_dd[i]) * _DEG2RAD)
+            k = hd[i] / 1000.0
+            cr[i] = CR_COEFFICIENT * (k * k)
+            elev[i] = station_elev + v_component + hi - th[i] + cr[i]
+        return elev, cr
+
+def calculate_trig_levels_batch(station_elev, hi, hd, va, th):
+    """
+    Calculates trigonometric leveling elevations for columns of observations.
+
+    Args:
+        station_elev (float): Elevation of the instrument station.
+        hi (float): Height of Instrument.
+        hd (list or np.ndarray): Horizontal distances.
+        va (list or np.ndarray): Zenith angles in DD.MMSS format.
+        th (list or np.ndarray): Target heights.
+
+    Returns:
+        tuple: (elevations, curvature and refraction corrections) as numpy arrays.
+    """
+    hd = np.asarray(hd, dtype=np.float64)
+    va = dms_to_dd_array(va)
+    th = np.asarray(th, dtype=np.float64)
+    if np.isnan(va).any():
+        raise ValueError("Invalid vertical angle in trigonometric leveling observations.")
+
+    if NUMBA_AVAILABLE:
+        return _trig_kernel(hd, va, th, float(station_elev), float(hi))
+
+    if NUMEXPR_AVAILABLE and hd.size >= NUMEXPR_MIN_SIZE:
+        # Same formula as below, evaluated fused and multi-threaded
+        station_elev, hi = float(station_elev), float(hi)
+        cr = ne.evaluate("CR_COEFFICIENT * (hd / 1000.0) ** 2",
+                         local_dict={'CR_COEFFICIENT': CR_COEFFICIENT, 'hd': hd})
+        final_elev = ne.evaluate("station_elev + hd * tan((90.0 - va) * DEG2RAD) + hi - th + cr",
+                                 local_dict={'station_elev': station_elev, 'hd': hd, 'va': va, 'DEG2RAD': _DEG2RAD,
+                                             'hi': hi, 'th': th, 'cr': cr})
+        return final_elev, cr
+
+    # Assume Zenith Angle (0 is Up, 90 is Horizon)
+    # Alpha (angle from horizon) = 90 - Zenith
+    alpha_rad = np.radians(90 - va)
+
+    # Vertical component V = HD * tan(alpha)
+    v_component = hd * np.tan(alpha_rad)
+
+    # Curvature and Refraction Correction (approx 0.0675 * k^2)
+    k = hd / 1000.0
+    cr = CR_COEFFICIENT * (k**2)
+
+    final_elev = station_elev + v_component + hi - th + cr
+    return final_elev, cr
 
 def calculate_trig_levels(station_elev, hi, observations):
     """
     Calculates elevations based on trigonometric leveling.
-    
+
     Args:
         station_elev (float): Elevation of the instrument station.
         hi (float): Height of Instrument.
         observations (list): List of dicts {'target', 'hd', 'va', 'th', 'type'}
-    
+
     Returns:
         list: Processed observations with calculated 'elevation'.
     """
-    results = []
-
-    for obs in observations:
-        hd = float(obs['hd'])
-        va_val = dms_to_dd(obs['va'])
-        th = float(obs['th'])
-        
-        # Assume Zenith Angle (0 is Up, 90 is Horizon)
-        # Alpha (angle from horizon) = 90 - Zenith
-        alpha_rad = math.radians(90 - va_val)
-        
-        # Vertical component V = HD * tan(alpha)
-        v_component = hd * math.tan(alpha_rad)
-        
-        # Curvature and Refraction Correction (approx 0.0675 * k^2)
-        k = hd / 1000.0
-        cr = 0.0675 * (k**2)
-        
-        final_elev = station_elev + v_component + hi - th + cr
-        
-        results.append({**obs, 'elevation': final_elev, 'cr': cr})
-        
-    return results
\ No newline at end of file
+    if not observations:
+        return []
+
+    final_elev, cr = calculate_trig_levels_batch(
+        station_elev, hi,
+        [obs['hd'] for obs in observations],
+        [obs['va'] for obs in observations],
+        [obs['th'] for obs in observations],
+    )
+
+    return [{**obs, 'elevation': elev, 'cr': c}
+            for obs, elev, c in zip(observations, final_elev.tolist(), cr.tolist())]
@@ -1,18 +1,42 @@
 """Functions to import/export CSV data using pandas."""
+import numpy as np
 import pandas as pd
 
-def import_csv_to_dataframe(file_path):
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+def import_csv_to_dataframe(file_path, dtype=None):
     """
     Imports data from a CSV file into a pandas DataFrame.
 
+    Uses the pyarrow CSV engine when pyarrow is installed and falls back to
+    the default C parser otherwise.
+
     Args:
         file_path (str): The path to the CSV file.
+        dtype (type or dict, optional): Column dtypes, which skip type inference
+            for those columns. Names missing from the file are ignored.
 
     Returns:
         pd.DataFrame or None: A DataFrame with the data, or None if an error occurs.
     """
     try:
-        return pd.read_csv(file_path)
+        if PYARROW_AVAILABLE:
+            try:
+                if isinstance(dtype, dict):
+                    # pandas' pyarrow engine applies dtype after inferring the columns,
+                    # so text such as "45.3000" would come back as "45.3"
+                    column_types = {name: pa.from_numpy_dtype(np.dtype(t)) for name, t in dtype.items()}
+                    convert_options = pacsv.ConvertOptions(column_types=column_types)
+                    return pacsv.read_csv(file_path, convert_options=convert_options).to_pandas()
+                return pd.read_csv(file_path, dtype=dtype, engine="pyarrow")
+            except (ValueError, pa.ArrowException):
+                pass # pyarrow rejects some files the C parser accepts (e.g. ragged rows)
+        return pd.read_csv(file_path, dtype=dtype, low_memory=False)
     except Exception as e:
         print(f"Error reading CSV file: {e}")
         return None
@@ -21,6 +45,9 @@ def export_dataframe_to_csv(df, file_path):
     """
     Exports a pandas DataFrame to a CSV file.
 
+    Every export goes through pandas' writer so the header quoting and float
+    text are the same whatever the size of the frame.
+
     Args:
         df (pd.DataFrame): The DataFrame to export.
         file_path (str): The path to save the CSV file.
@@ -1,21 +1,50 @@
 # Logic to generate KML files
 def export_to_kml(data, output_path):
     pass
-import simplekml
+from xml.sax.saxutils import escape
 
-def export_to_kml(output_filename, points):
+try:
+    import simplekml
+    SIMPLEKML_AVAILABLE = True
+except ImportError:
+    SIMPLEKML_AVAILABLE = False
+
+_KML_HEADER = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+               '<kml xmlns="http://www.opengis.net/kml/2.2">\n<Document>\n')
+_KML_FOOTER = '</Document>\n</kml>\n'
+
+def export_to_kml(output_filename, points, use_simplekml=False):
     """
     Exports a list of coordinates to a KML file.
 
+    The KML text is written directly in a single pass; the older simplekml
+    writer is kept behind use_simplekml for compatibility.
+
     Args:
         output_filename (str): Path to save the KML file.
-        points (list of tuples): List of (name, longitude, latitude) tuples.
+        points (list of tuples): List of (name, longitude, latitude) or
+            (name, longitude, latitude, elevation) tuples.
+        use_simplekml (bool): Build the file with simplekml instead.
+
+    Raises:
+        ImportError: If use_simplekml is set and simplekml is not installed.
     """
-    kml = simplekml.Kml()
-    for name, lon, lat in points:
-        kml.newpoint(name=name, coords=[(lon, lat)])
+    if use_simplekml:
+        if not SIMPLEKML_AVAILABLE:
+            raise ImportError("use_simplekml=True requires simplekml. Install it with: python -m pip install simplekml")
+        kml = simplekml.Kml()
+        for name, *coords in points:
+            kml.newpoint(name=name, coords=[tuple(coords)])
+        kml.save(output_filename)
+        return
 
-    kml.save(output_filename)
+    placemarks = "".join(
+        f"<Placemark><name>{escape(str(name))}</name>"
+        f"<Point><coordinates>{','.join(str(float(c)) for c in coords)}</coordinates></Point></Placemark>\n"
+        for name, *coords in points
+    )
+    with open(output_filename, "w", encoding="utf-8") as f:
+        f.write(_KML_HEADER + placemarks + _KML_FOOTER)
 
 # Example Usage:
 # # NOTE: KML uses (longitude, latitude) order!
@@ -1,80 +1,196 @@
 """
 Service to generate PDF reports using the reportlab library.
 """
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib import colors
-from reportlab.lib.units import inch
+import functools
+import io
+from types import SimpleNamespace
+from xml.sax.saxutils import escape
+import numpy as np
+
+@functools.lru_cache(maxsize=None)
+def _lazy_rl():
+    """
+    Imports reportlab and builds the shared stylesheet and table styles on first use.
 
-def generate_traverse_report(title_text, summary_data, traverse_df, file_path):
+    The UI tabs import this module at startup, so reportlab is only loaded
+    once a report is actually generated.
+
+    Returns:
+        SimpleNamespace: The reportlab classes used here plus the styles.
     """
-    Generates a PDF report for a compass traverse calculation.
+    from reportlab.platypus import BaseDocTemplate, PageTemplate, Frame, Paragraph, Spacer, Table, TableStyle
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.lib import colors
+    from reportlab.lib.units import inch
+
+    summary_style = TableStyle([
+        ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
+        ('INNERGRID', (0, 0), (-1, -1), 0.25, colors.black),
+        ('BOX', (0, 0), (-1, -1), 0.25, colors.black),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ])
+
+    data_style = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('INNERGRID', (0, 0), (-1, -1), 0.25, colors.black),
+        ('BOX', (0, 0), (-1, -1), 0.25, colors.black),
+    ])
+
+    return SimpleNamespace(BaseDocTemplate=BaseDocTemplate, PageTemplate=PageTemplate, Frame=Frame,
+                           Paragraph=Paragraph, Spacer=Spacer,
+                           Table=Table, inch=inch, styles=getSampleStyleSheet(),
+                           summary_style=summary_style, data_style=data_style)
+
+def _df_to_rows(df):
+    """
+    Converts a DataFrame into table rows (header first) one column at a time.
+
+    Going column by column avoids df.values, which upcasts mixed-dtype frames
+    to a single object array. Float columns are formatted to 4 decimals here in
+    one vectorised call instead of per cell during layout.
+    """
+    columns = []
+    for i in range(df.shape[1]):
+        col = df.iloc[:, i]
+        if col.dtype.kind == 'f':
+            values = col.to_numpy()
+            # Blank out cells that were never calculated instead of printing "nan"
+            columns.append(np.where(np.isnan(values), "", np.char.mod('%.4f', values)).tolist())
+        else:
+            columns.append(col.tolist())
+    return [df.columns.tolist()] + [list(row) for row in zip(*columns)]
+
+@functools.lru_cache(maxsize=None)
+def _doc_template():
+    """
+    Builds the page template shared by every report, once per process.
+
+    Same page layout as SimpleDocTemplate (one full-page frame, half inch
+    margins), but the template is kept, and not rebuilt and re-added for every
+    document.
+    """
+    rl = _lazy_rl()
+    doc = rl.BaseDocTemplate(None, pageCompression=0,
+                             rightMargin=rl.inch/2, leftMargin=rl.inch/2,
+                             topMargin=rl.inch/2, bottomMargin=rl.inch/2)
+    frame = rl.Frame(doc.leftMargin, doc.bottomMargin, doc.width, doc.height, id='normal')
+    doc.addPageTemplates([rl.PageTemplate(id='Report', frames=[frame])])
+    return doc
+
+def _make_doc(target):
+    """Returns the shared report template pointed at a new output file or buffer."""
+    doc = _doc_template()
+    doc.filename = target
+    return doc
+
+# Summary values longer than this are wrapped in a Paragraph so they fit the
+# value column; shorter ones stay plain strings, which are much cheaper to lay out
+_SUMMARY_WRAP_CHARS = 60
+
+def _summary_cell(value, style):
+    text = str(value)
+    if len(text) <= _SUMMARY_WRAP_CHARS:
+        return text
+    # Paragraph parses its text as markup
+    return _lazy_rl().Paragraph(escape(text), style)
+
+# Long tables are split into blocks of this many rows; ReportLab's layout of a
+# single huge Table slows down far worse than linearly
+_MAX_TABLE_ROWS = 500
+
+def _data_tables(data_list):
+    """
+    Builds the styled data table flowables for a header + rows list.
+
+    Returns:
+        list: Table and Spacer flowables, one table per block of _MAX_TABLE_ROWS rows.
+    """
+    rl = _lazy_rl()
+    header, rows = data_list[0], data_list[1:]
+    flowables = []
+    for start in range(0, max(len(rows), 1), _MAX_TABLE_ROWS):
+        table = rl.Table([header] + rows[start:start + _MAX_TABLE_ROWS], repeatRows=1) # Repeat header on new pages
+        table.setStyle(rl.data_style)
+        flowables.append(table)
+        flowables.append(rl.Spacer(1, 0.05*rl.inch))
+    return flowables
+
+def _build_report(title_text, summary_heading, data_heading, summary_data, df, file_path):
+    """
+    Builds a report with a title, a key/value summary table and a data table.
 
     Args:
         title_text (str): The main title of the report.
+        summary_heading (str): Heading above the summary table.
+        data_heading (str): Heading above the data table.
         summary_data (dict): A dictionary containing key-value pairs for the summary section.
-        traverse_df (pd.DataFrame): A DataFrame with the main traverse data.
+        df (pd.DataFrame): A DataFrame with the main report data.
         file_path (str): The path to save the generated PDF file.
 
     Returns:
         bool: True if the report was generated successfully, False otherwise.
     """
     try:
-        doc = SimpleDocTemplate(file_path,
-                                rightMargin=inch/2, leftMargin=inch/2,
-                                topMargin=inch/2, bottomMargin=inch/2)
+        rl = _lazy_rl()
+        inch = rl.inch
+
+        # Build in memory without stream compression, then write the file in one go
+        buffer = io.BytesIO()
+        doc = _make_doc(buffer)
         
         story = []
-        styles = getSampleStyleSheet()
+        styles = rl.styles
 
         # 1. Title
-        story.append(Paragraph(title_text, styles['h1']))
-        story.append(Spacer(1, 0.2*inch))
-
-        # 2. Calculation Summary
-        story.append(Paragraph("Calculation Summary", styles['h2']))
-        summary_list = [[key, value] for key, value in summary_data.items()]
-        summary_table = Table(summary_list, colWidths=[2.5*inch, 4.5*inch])
-        summary_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-            ('INNERGRID', (0, 0), (-1, -1), 0.25, colors.black),
-            ('BOX', (0, 0), (-1, -1), 0.25, colors.black),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ]))
+        story.append(rl.Paragraph(title_text, styles['h1']))
+        story.append(rl.Spacer(1, 0.2*inch))
+
+        # 2. Summary
+        story.append(rl.Paragraph(summary_heading, styles['h2']))
+        body = styles['BodyText']
+        summary_list = [[key, _summary_cell(value, body)] for key, value in summary_data.items()]
+        summary_table = rl.Table(summary_list, colWidths=[2.5*inch, 4.5*inch])
+        summary_table.setStyle(rl.summary_style)
         story.append(summary_table)
-        story.append(Spacer(1, 0.2*inch))
+        story.append(rl.Spacer(1, 0.2*inch))
 
-        # 3. Traverse Data Table
-        story.append(Paragraph("Adjusted Traverse Data", styles['h2']))
-        
+        # 3. Data Table
+        story.append(rl.Paragraph(data_heading, styles['h2']))
         # Convert dataframe to list of lists for the table, including headers
-        data_list = [traverse_df.columns.values.tolist()] + traverse_df.values.tolist()
-        
-        data_table = Table(data_list, repeatRows=1) # Repeat header on new pages
-        data_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('INNERGRID', (0, 0), (-1, -1), 0.25, colors.black),
-            ('BOX', (0, 0), (-1, -1), 0.25, colors.black),
-        ]))
-        story.append(data_table)
-
-        # *** This is the crucial step that was missing ***
-        # Build the document
-        doc.build(story)
+        story.extend(_data_tables(_df_to_rows(df)))
 
+        doc.build(story)
+        with open(file_path, 'wb', buffering=1 << 20) as f:
+            f.write(buffer.getbuffer())
         return True
 
     except Exception as e:
         # In a real application, you'd want to log this error
-        print(f"Error generating PDF: {e}")
+        print(f"Error generating {title_text} PDF: {e}")
         return False
 
+def generate_traverse_report(title_text, summary_data, traverse_df, file_path):
+    """
+    Generates a PDF report for a compass traverse calculation.
+
+    Args:
+        title_text (str): The main title of the report.
+        summary_data (dict): A dictionary containing key-value pairs for the summary section.
+        traverse_df (pd.DataFrame): A DataFrame with the main traverse data.
+        file_path (str): The path to save the generated PDF file.
+
+    Returns:
+        bool: True if the report was generated successfully, False otherwise.
+    """
+    return _build_report(title_text, "Calculation Summary", "Adjusted Traverse Data",
+                         summary_data, traverse_df, file_path)
+
 def generate_leveling_report(summary_data, leveling_df, file_path):
     """
     Generates a PDF report for a differential leveling calculation.
@@ -87,43 +203,8 @@ def generate_leveling_report(summary_data, leveling_df, file_path):
     Returns:
         bool: True if the report was generated successfully, False otherwise.
     """
-    try:
-        doc = SimpleDocTemplate(file_path,
-                                rightMargin=inch/2, leftMargin=inch/2,
-                                topMargin=inch/2, bottomMargin=inch/2)
-        
-        story = []
-        styles = getSampleStyleSheet()
-
-        # 1. Title
-        story.append(Paragraph("Differential Leveling Report", styles['h1']))
-        story.append(Spacer(1, 0.2*inch))
-
-        # 2. Calculation Summary
-        story.append(Paragraph("Calculation Summary", styles['h2']))
-        summary_list = [[key, value] for key, value in summary_data.items()]
-        summary_table = Table(summary_list, colWidths=[2.5*inch, 4.5*inch])
-        summary_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-            ('INNERGRID', (0, 0), (-1, -1), 0.25, colors.black),
-            ('BOX', (0, 0), (-1, -1), 0.25, colors.black),
-        ]))
-        story.append(summary_table)
-        story.append(Spacer(1, 0.2*inch))
-
-        # 3. Leveling Data Table
-        story.append(Paragraph("Leveling Field Notes", styles['h2']))
-        data_list = [leveling_df.columns.values.tolist()] + leveling_df.values.tolist()
-        data_table = Table(data_list, repeatRows=1)
-        # Apply similar styling as the traverse report table
-        data_table.setStyle(TableStyle(generate_traverse_report.__defaults__[0][10].getCommands()))
-        story.append(data_table)
-
-        doc.build(story)
-        return True
-    except Exception as e:
-        print(f"Error generating leveling PDF: {e}")
-        return False
+    return _build_report("Differential Leveling Report", "Calculation Summary", "Leveling Field Notes",
+                         summary_data, leveling_df, file_path)
 
 def generate_trig_leveling_report(summary_data, observations_df, file_path):
     """
@@ -137,42 +218,8 @@ def generate_trig_leveling_report(summary_data, observations_df, file_path):
     Returns:
         bool: True if the report was generated successfully, False otherwise.
     """
-    try:
-        doc = SimpleDocTemplate(file_path,
-                                rightMargin=inch/2, leftMargin=inch/2,
-                                topMargin=inch/2, bottomMargin=inch/2)
-        
-        story = []
-        styles = getSampleStyleSheet()
-
-        # 1. Title
-        story.append(Paragraph("Trigonometric Leveling Report", styles['h1']))
-        story.append(Spacer(1, 0.2*inch))
-
-        # 2. Station Setup Summary
-        story.append(Paragraph("Instrument Station Setup", styles['h2']))
-        summary_list = [[key, value] for key, value in summary_data.items()]
-        summary_table = Table(summary_list, colWidths=[2.5*inch, 4.5*inch])
-        summary_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-            ('INNERGRID', (0, 0), (-1, -1), 0.25, colors.black),
-            ('BOX', (0, 0), (-1, -1), 0.25, colors.black),
-        ]))
-        story.append(summary_table)
-        story.append(Spacer(1, 0.2*inch))
-
-        # 3. Observations Data Table
-        story.append(Paragraph("Observations and Results", styles['h2']))
-        data_list = [observations_df.columns.values.tolist()] + observations_df.values.tolist()
-        data_table = Table(data_list, repeatRows=1)
-        data_table.setStyle(TableStyle(generate_traverse_report.__defaults__[0][10].getCommands()))
-        story.append(data_table)
-
-        doc.build(story)
-        return True
-    except Exception as e:
-        print(f"Error generating Trig. Leveling PDF: {e}")
-        return False
+    return _build_report("Trigonometric Leveling Report", "Instrument Station Setup", "Observations and Results",
+                         summary_data, observations_df, file_path)
 
 def generate_theodolite_report(summary_data, traverse_df, file_path):
     """
@@ -186,39 +233,5 @@ def generate_theodolite_report(summary_data, traverse_df, file_path):
     Returns:
         bool: True if the report was generated successfully, False otherwise.
     """
-    try:
-        doc = SimpleDocTemplate(file_path,
-                                rightMargin=inch/2, leftMargin=inch/2,
-                                topMargin=inch/2, bottomMargin=inch/2)
-        
-        story = []
-        styles = getSampleStyleSheet()
-
-        # 1. Title
-        story.append(Paragraph("Theodolite Traverse Report", styles['h1']))
-        story.append(Spacer(1, 0.2*inch))
-
-        # 2. Calculation Summary
-        story.append(Paragraph("Calculation Summary", styles['h2']))
-        summary_list = [[key, value] for key, value in summary_data.items()]
-        summary_table = Table(summary_list, colWidths=[2.5*inch, 4.5*inch])
-        summary_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-            ('INNERGRID', (0, 0), (-1, -1), 0.25, colors.black),
-            ('BOX', (0, 0), (-1, -1), 0.25, colors.black),
-        ]))
-        story.append(summary_table)
-        story.append(Spacer(1, 0.2*inch))
-
-        # 3. Traverse Data Table
-        story.append(Paragraph("Traverse Field Data & Results", styles['h2']))
-        data_list = [traverse_df.columns.values.tolist()] + traverse_df.values.tolist()
-        data_table = Table(data_list, repeatRows=1)
-        data_table.setStyle(TableStyle(generate_traverse_report.__defaults__[0][10].getCommands()))
-        story.append(data_table)
-
-        doc.build(story)
-        return True
-    except Exception as e:
-        print(f"Error generating Theodolite PDF: {e}")
-        return False
\ No newline at end of file
+    return _build_report("Theodolite Traverse Report", "Calculation Summary", "Traverse Field Data & Results",
+                         summary_data, traverse_df, file_path)
@@ -1,23 +1,19 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import math
+from importlib.util import find_spec
 
-# Try to import folium for maps
-try:
-    import folium
-    from streamlit_folium import st_folium
-    FOLIUM_AVAILABLE = True
-except ImportError:
-    FOLIUM_AVAILABLE = False
+# Check for folium without importing it; matplotlib and folium are only
+# imported inside the handlers that draw something
+FOLIUM_AVAILABLE = find_spec("folium") is not None and find_spec("streamlit_folium") is not None
 
 # --- Import Core Logic ---
 try:
-    from core.calculations import dms_to_dd, dd_to_dms, calculate_lat_dep, calculate_coordinates
-    from core.adjustments import adjust_traverse_bowditch
+    from core.calculations import dms_to_dd, dms_to_dd_array, dd_to_dms_array
+    from core.adjustments import traverse_bowditch
     from core.coordinate_converter import convert_to_global, convert_coords
-    from core.trigonometric_leveling import calculate_trig_levels
+    from core.leveling import calculate_levels
+    from core.trigonometric_leveling import calculate_trig_levels_batch
     from core.triangulation import calculate_simple_triangulation
 except ImportError as e:
     st.error(f"Could not import core modules: {e}")
@@ -25,6 +21,61 @@ except ImportError as e:
     st.stop()
 
 st.set_page_config(page_title="Modern Survey", layout="wide", page_icon="📐")
+
+def fmt(values, spec="%.4f"):
+    """Formats numbers once as display strings (cheaper than a Styler on every rerun)."""
+    return np.char.mod(spec, np.asarray(values, dtype=float))
+
+# Streamlit reruns the whole script on every widget change; these keep the pure
+# calculations from being redone unless their inputs actually change.
+TRI_KEYS = ('p1', 'p2', 'p3', 'a1', 'a2', 'a3', 'dir')
+
+@st.cache_data
+def cached_trig_levels(station_elev, hi, hd, va, th):
+    return calculate_trig_levels_batch(station_elev, hi, hd, va, th)
+
+@st.cache_data
+def cached_triangulation(start_e, start_n, base_dist, base_az, tri_rows):
+    triangles = [dict(zip(TRI_KEYS, row)) for row in tri_rows]
+    return calculate_simple_triangulation(start_e, start_n, base_dist, base_az, triangles)
+
+# Seed rows for each tab's editor; the frames are built once per server process
+DEFAULT_TABLES = {
+    "compass": ([{"Line": "1-2", "Azimuth": "45.0000", "Distance": 100.0}],
+                ["Line", "Azimuth", "Distance"]),
+    "theo": ([{"Line": "1-2", "Angle": "90.0000", "Upper": 1.5, "Lower": 0.5, "V.Angle": "0.0"}],
+             ["Line", "Angle", "Upper", "Lower", "V.Angle"]),
+    "level": ([{"Station": "BM1", "BS": 1.5, "FS": 0.0}, {"Station": "TP1", "BS": 0.0, "FS": 1.2}],
+              ["Station", "BS", "FS"]),
+    "trig": ([{"Target": "T1", "HD": 50.0, "VA (DD.MMSS)": "0.0000", "TH": 1.5}],
+             ["Target", "HD", "VA (DD.MMSS)", "TH"]),
+    "tri": ([{"P1": "A", "P2": "B", "P3": "C", "A1": "60.0000", "A2": "60.0000", "A3": "60.0000", "Dir": "Left"}],
+            ["P1", "P2", "P3", "A1", "A2", "A3", "Dir"]),
+    "gps": ([{"Name": "P1", "X/Lon": 12.4924, "Y/Lat": 41.8902, "Z": 50.0}],
+            ["Name", "X/Lon", "Y/Lat", "Z"]),
+}
+
+@st.cache_data
+def initial_frame(name):
+    rows, columns = DEFAULT_TABLES[name]
+    return pd.DataFrame(rows, columns=columns)
+
+def cached_figure(name):
+    """
+    Returns this session's long-lived (fig, ax) for a tab with the axes cleared.
+
+    Figures live in st.session_state so concurrent sessions never draw on the
+    same Axes; they are plain Figures, kept out of pyplot's global registry.
+    """
+    figures = st.session_state.setdefault("_figures", {})
+    if name not in figures:
+        from matplotlib.figure import Figure
+        fig = Figure()
+        figures[name] = (fig, fig.add_subplot())
+    fig, ax = figures[name]
+    ax.cla()
+    return fig, ax
+
 st.title("📐 Modern Survey System (Web)")
 
 # --- Tabs ---
@@ -52,43 +103,33 @@ with tabs[0]:
     
     with c2:
         if "compass_data" not in st.session_state:
-            st.session_state.compass_data = pd.DataFrame(
-                [{"Line": "1-2", "Azimuth": "45.0000", "Distance": 100.0}],
-                columns=["Line", "Azimuth", "Distance"]
-            )
-        comp_df = st.data_editor(st.session_state.compass_data, num_rows="dynamic", use_container_width=True)
+            st.session_state.compass_data = initial_frame("compass")
+        comp_df = st.data_editor(st.session_state.compass_data, key="compass_editor", num_rows="dynamic", use_container_width=True)
 
     if st.button("Calculate Compass Traverse"):
         try:
             lines = comp_df["Line"].tolist()
-            raw_az = comp_df["Azimuth"].astype(str).tolist()
-            dists = comp_df["Distance"].astype(float).values
+            dists = comp_df["Distance"].to_numpy(dtype=np.float64)
             
             if len(dists) > 0:
-                # Convert Angles
+                # Convert Angles; DD.MMSS stays as text because "45.3000" and 45.3 differ
                 if "DD.MMSS" in comp_fmt:
-                    bearings = np.array([dms_to_dd(b) for b in raw_az])
+                    bearings = dms_to_dd_array(comp_df["Azimuth"].to_numpy())
                 else:
-                    bearings = np.array([float(b) for b in raw_az])
+                    bearings = comp_df["Azimuth"].astype(float).to_numpy()
                 
                 # Calculate
-                lats, deps = calculate_lat_dep(bearings, dists)
-                adj_lat, adj_dep, _, _ = adjust_traverse_bowditch(dists, lats, deps)
-                coords = calculate_coordinates(comp_start_n, comp_start_e, adj_lat, adj_dep)
+                lats, deps, coords = traverse_bowditch(comp_start_n, comp_start_e, bearings, dists)
                 
                 # Results
-                res_data = []
-                for i in range(len(lines)):
-                    res_data.append({
-                        "Line": lines[i], "Lat": lats[i], "Dep": deps[i],
-                        "Adj N": coords[i+1][1], "Adj E": coords[i+1][0]
-                    })
-                st.dataframe(pd.DataFrame(res_data).style.format("{:.4f}"))
+                st.dataframe(pd.DataFrame({
+                    "Line": lines, "Lat": fmt(lats), "Dep": fmt(deps),
+                    "Adj N": fmt(coords[1:, 1]), "Adj E": fmt(coords[1:, 0])
+                }))
                 
                 # Plot
-                fig, ax = plt.subplots()
-                es, ns = zip(*coords)
-                ax.plot(es, ns, 'b-o')
+                fig, ax = cached_figure("compass")
+                ax.plot(coords[:, 0], coords[:, 1], 'b-o')
                 for i, (e, n) in enumerate(coords):
                     ax.text(e, n, f" P{i}")
                 ax.set_aspect('equal')
@@ -112,61 +153,47 @@ with tabs[1]:
 
     with t2:
         if "theo_data" not in st.session_state:
-            st.session_state.theo_data = pd.DataFrame(
-                [{"Line": "1-2", "Angle": "90.0000", "Upper": 1.5, "Lower": 0.5, "V.Angle": "0.0"}],
-                columns=["Line", "Angle", "Upper", "Lower", "V.Angle"]
-            )
-        theo_df = st.data_editor(st.session_state.theo_data, num_rows="dynamic", use_container_width=True)
+            st.session_state.theo_data = initial_frame("theo")
+        theo_df = st.data_editor(st.session_state.theo_data, key="theo_editor", num_rows="dynamic", use_container_width=True)
 
     if st.button("Calculate Theodolite"):
         try:
-            # Parse Data
-            rows = theo_df.to_dict('records')
-            if not rows: st.stop()
+            if theo_df.empty: st.stop()
             
             # Initial Azimuth
-            curr_az = dms_to_dd(theo_init_az)
+            init_az = dms_to_dd(theo_init_az)
             
-            results = []
-            coords = [(theo_start_e, theo_start_n)]
+            # 1. Distances from Stadia, for all rows at once
+            upper = theo_df['Upper'].astype(float).to_numpy()
+            lower = theo_df['Lower'].astype(float).to_numpy()
+            va = dms_to_dd_array(theo_df['V.Angle'].astype(str))
+            angles = dms_to_dd_array(theo_df['Angle'].astype(str))
+            if np.isnan(va).any() or np.isnan(angles).any():
+                raise ValueError("Invalid angle, expected DD.MMSS.")
+            dists = theo_k * (upper - lower) * np.cos(np.radians(va))**2
             
-            for row in rows:
-                # 1. Distance from Stadia
-                u, l = float(row['Upper']), float(row['Lower'])
-                va_dms = str(row['V.Angle'])
-                va = dms_to_dd(va_dms)
-                dist = theo_k * (u - l) * (math.cos(math.radians(va))**2)
-                
-                # 2. Azimuth
-                angle_dms = str(row['Angle'])
-                angle = dms_to_dd(angle_dms)
-                
-                back_az = (curr_az + 180) % 360
-                if "Interior" in theo_angle_type:
-                    next_az = (back_az + angle) % 360
-                else:
-                    next_az = (back_az - angle) % 360
-                
-                curr_az = next_az
-                
-                # 3. Coords
-                lat = dist * math.cos(math.radians(curr_az))
-                dep = dist * math.sin(math.radians(curr_az))
-                
-                prev_e, prev_n = coords[-1]
-                new_e = prev_e + dep
-                new_n = prev_n + lat
-                coords.append((new_e, new_n))
-                
-                results.append({
-                    "Line": row['Line'], "Dist": dist, "Azimuth": dd_to_dms(curr_az),
-                    "Lat": lat, "Dep": dep, "N": new_n, "E": new_e
-                })
+            # 2. Azimuths: each leg is back azimuth (+180) +/- the turned angle,
+            # which unrolls to a cumulative sum of the angles
+            sign = 1.0 if "Interior" in theo_angle_type else -1.0
+            legs = np.arange(1, len(angles) + 1)
+            azimuths = (init_az + 180.0 * legs + sign * np.cumsum(angles)) % 360
+            
+            # 3. Coords
+            lats = dists * np.cos(np.radians(azimuths))
+            deps = dists * np.sin(np.radians(azimuths))
+            eastings = theo_start_e + np.cumsum(deps)
+            northings = theo_start_n + np.cumsum(lats)
+            coords = list(zip([theo_start_e] + eastings.tolist(), [theo_start_n] + northings.tolist()))
             
-            st.dataframe(pd.DataFrame(results).style.format({"Dist": "{:.3f}", "Lat": "{:.3f}", "Dep": "{:.3f}", "N": "{:.3f}", "E": "{:.3f}"}))
+            results = pd.DataFrame({
+                "Line": theo_df['Line'].to_numpy(), "Dist": fmt(dists, "%.3f"), "Azimuth": dd_to_dms_array(azimuths),
+                "Lat": fmt(lats, "%.3f"), "Dep": fmt(deps, "%.3f"), "N": fmt(northings, "%.3f"), "E": fmt(eastings, "%.3f")
+            })
+            
+            st.dataframe(results)
             
             # Plot
-            fig, ax = plt.subplots()
+            fig, ax = cached_figure("theodolite")
             es, ns = zip(*coords)
             ax.plot(es, ns, 'r-^')
             for i, (e, n) in enumerate(coords):
@@ -186,46 +213,27 @@ with tabs[2]:
     start_bm = st.number_input("Start BM Elevation", value=100.0)
     
     if "level_data" not in st.session_state:
-        st.session_state.level_data = pd.DataFrame(
-            [{"Station": "BM1", "BS": 1.5, "FS": 0.0}, {"Station": "TP1", "BS": 0.0, "FS": 1.2}],
-            columns=["Station", "BS", "FS"]
-        )
-    lev_df = st.data_editor(st.session_state.level_data, num_rows="dynamic", use_container_width=True)
+        st.session_state.level_data = initial_frame("level")
+    lev_df = st.data_editor(st.session_state.level_data, key="level_editor", num_rows="dynamic", use_container_width=True)
     
     if st.button("Calculate Levels"):
         try:
-            rows = lev_df.to_dict('records')
-            if rows:
-                rows[0]['Elevation'] = start_bm
-                rows[0]['HI'] = 0.0
-                
-                curr_hi = 0.0
-                total_bs, total_fs = 0.0, 0.0
+            if not lev_df.empty:
+                bs = lev_df['BS'].fillna(0).astype(float).to_numpy()
+                fs = lev_df['FS'].fillna(0).astype(float).to_numpy()
+                hi, elevations = calculate_levels(start_bm, bs, fs)
                 
-                for i, row in enumerate(rows):
-                    bs = float(row.get('BS', 0) or 0)
-                    fs = float(row.get('FS', 0) or 0)
-                    
-                    if 'Elevation' in row:
-                        if bs > 0:
-                            curr_hi = row['Elevation'] + bs
-                            row['HI'] = curr_hi
-                            total_bs += bs
-                    
-                    if fs > 0 and i + 1 < len(rows):
-                        if row.get('HI', 0) == 0 and i > 0:
-                            curr_hi = rows[i-1]['HI']
-                            row['HI'] = curr_hi
-                        
-                        next_elev = curr_hi - fs
-                        rows[i+1]['Elevation'] = next_elev
-                        total_fs += fs
-                
-                res_df = pd.DataFrame(rows)
-                st.dataframe(res_df[["Station", "BS", "HI", "FS", "Elevation"]].style.format("{:.4f}"))
+                res_df = pd.DataFrame({
+                    "Station": lev_df['Station'].to_numpy(), "BS": fmt(bs), "HI": fmt(hi), "FS": fmt(fs),
+                    "Elevation": fmt(elevations[:-1])
+                })
+                st.dataframe(res_df)
                 
+                # The last row's FS has no station below it in this table
+                total_bs = bs[bs > 0].sum()
+                total_fs = fs[:-1].sum()
                 check = start_bm + total_bs - total_fs
-                end_elev = rows[-1].get('Elevation', 0)
+                end_elev = elevations[-2]
                 st.success(f"Check: {check:.4f} | End Elev: {end_elev:.4f} | Misclosure: {check - end_elev:.4f}")
         except Exception as e:
             st.error(f"Error: {e}")
@@ -241,27 +249,24 @@ with tabs[3]:
         trig_hi = st.number_input("Instrument Height (HI)", value=1.5)
     
     if "trig_data" not in st.session_state:
-        st.session_state.trig_data = pd.DataFrame(
-            [{"Target": "T1", "HD": 50.0, "VA (DD.MMSS)": "0.0000", "TH": 1.5}],
-            columns=["Target", "HD", "VA (DD.MMSS)", "TH"]
-        )
-    trig_df = st.data_editor(st.session_state.trig_data, num_rows="dynamic", use_container_width=True)
+        st.session_state.trig_data = initial_frame("trig")
+    trig_df = st.data_editor(st.session_state.trig_data, key="trig_editor", num_rows="dynamic", use_container_width=True)
     
     if st.button("Calculate Trig Levels"):
         try:
-            obs_list = []
-            for _, row in trig_df.iterrows():
-                obs_list.append({
-                    'target': row['Target'],
-                    'hd': row['HD'],
-                    'va': row['VA (DD.MMSS)'],
-                    'th': row['TH']
-                })
-            
-            results = calculate_trig_levels(trig_stn_elev, trig_hi, obs_list)
+            # Whole columns go straight to the batch calculation (and the cache key)
+            elevations, corrections = cached_trig_levels(
+                trig_stn_elev, trig_hi,
+                trig_df['HD'].to_numpy(dtype=np.float64),
+                trig_df['VA (DD.MMSS)'].astype(str).to_numpy(),
+                trig_df['TH'].to_numpy(dtype=np.float64)
+            )
             
-            res_data = [{"Target": r['target'], "Elevation": r['elevation'], "Correction": r['cr']} for r in results]
-            st.dataframe(pd.DataFrame(res_data).style.format("{:.4f}"))
+            st.dataframe(pd.DataFrame({
+                "Target": trig_df['Target'].to_numpy(),
+                "Elevation": fmt(elevations),
+                "Correction": fmt(corrections)
+            }))
         except Exception as e:
             st.error(f"Error: {e}")
 
@@ -279,13 +284,11 @@ with tabs[4]:
         tri_base_az = st.text_input("Base Azimuth (DD.MMSS)", value="90.0000")
     
     if "tri_data" not in st.session_state:
-        st.session_state.tri_data = pd.DataFrame(
-            [{"P1": "A", "P2": "B", "P3": "C", "A1": "60.0000", "A2": "60.0000", "A3": "60.0000", "Dir": "Left"}],
-            columns=["P1", "P2", "P3", "A1", "A2", "A3", "Dir"]
-        )
+        st.session_state.tri_data = initial_frame("tri")
     
     tri_df = st.data_editor(
         st.session_state.tri_data, 
+        key="tri_editor",
         num_rows="dynamic", 
         use_container_width=True,
         column_config={
@@ -295,43 +298,45 @@ with tabs[4]:
     
     if st.button("Calculate Network"):
         try:
-            triangles = []
-            for _, row in tri_df.iterrows():
-                triangles.append({
-                    'p1': row['P1'], 'p2': row['P2'], 'p3': row['P3'],
-                    'a1': str(row['A1']), 'a2': str(row['A2']), 'a3': str(row['A3']),
-                    'dir': row['Dir']
-                })
-            
-            stations, results = calculate_simple_triangulation(tri_start_e, tri_start_n, tri_base_dist, tri_base_az, triangles)
+            tri_rows = tuple(zip(
+                tri_df['P1'].tolist(), tri_df['P2'].tolist(), tri_df['P3'].tolist(),
+                tri_df['A1'].astype(str).tolist(), tri_df['A2'].astype(str).tolist(), tri_df['A3'].astype(str).tolist(),
+                tri_df['Dir'].tolist()
+            ))
+            triangles = [dict(zip(TRI_KEYS, row)) for row in tri_rows]
+            stations, results = cached_triangulation(tri_start_e, tri_start_n, tri_base_dist, tri_base_az, tri_rows)
             
             st.subheader("Station Coordinates")
-            st_data = [{"Station": k, "Easting": v[0], "Northing": v[1]} for k, v in stations.items()]
-            st.dataframe(pd.DataFrame(st_data).style.format("{:.3f}"))
+            st_coords = np.array(list(stations.values()), dtype=float).reshape(-1, 2)
+            st.dataframe(pd.DataFrame({
+                "Station": list(stations), "Easting": fmt(st_coords[:, 0], "%.3f"), "Northing": fmt(st_coords[:, 1], "%.3f")
+            }))
             
             st.subheader("Triangle Closures")
-            res_data = [{"Triangle": r['triangle'], "Error (sec)": r['error'], "Base": r['dist_base']} for r in results]
-            st.dataframe(pd.DataFrame(res_data))
+            st.dataframe(pd.DataFrame({
+                "Triangle": [r['triangle'] for r in results],
+                "Error (sec)": np.fromiter((r['error'] for r in results), dtype=float, count=len(results)),
+                "Base": np.fromiter((r['dist_base'] for r in results), dtype=float, count=len(results))
+            }))
             
             # Plot
-            fig, ax = plt.subplots()
+            fig, ax = cached_figure("triangulation")
+            ax.scatter(st_coords[:, 0], st_coords[:, 1], c='r')
             for k, v in stations.items():
-                ax.plot(v[0], v[1], 'ro')
                 ax.text(v[0], v[1], f" {k}")
             
             # Draw lines (simplified)
-            pts = list(stations.values())
-            if len(pts) > 1:
+            if len(st_coords) > 1:
                 # Draw base
-                ax.plot([pts[0][0], pts[1][0]], [pts[0][1], pts[1][1]], 'k-')
-                # Draw others roughly
-                for tri in triangles:
-                    if tri['p1'] in stations and tri['p3'] in stations:
-                        p1, p3 = stations[tri['p1']], stations[tri['p3']]
-                        ax.plot([p1[0], p3[0]], [p1[1], p3[1]], 'b--')
-                    if tri['p2'] in stations and tri['p3'] in stations:
-                        p2, p3 = stations[tri['p2']], stations[tri['p3']]
-                        ax.plot([p2[0], p3[0]], [p2[1], p3[1]], 'b--')
+                ax.plot(st_coords[:2, 0], st_coords[:2, 1], 'k-')
+                # Draw the triangle sides as a single collection; adjacent
+                # triangles share sides, so each edge is only drawn once
+                edges = {frozenset((tri[a], tri['p3'])) for tri in triangles for a in ('p1', 'p2')}
+                segs = [[stations[a], stations[b]] for a, b in (tuple(e) for e in edges if len(e) == 2)
+                        if a in stations and b in stations]
+                if segs:
+                    from matplotlib.collections import LineCollection
+                    ax.add_collection(LineCollection(segs, colors='b', linestyles='--'))
 
             ax.set_aspect('equal')
             ax.grid(True)
@@ -352,41 +357,41 @@ with tabs[5]:
         to_epsg = st.number_input("To EPSG", value=32632, step=1)
         
     if "gps_data" not in st.session_state:
-        st.session_state.gps_data = pd.DataFrame(
-            [{"Name": "P1", "X/Lon": 12.4924, "Y/Lat": 41.8902, "Z": 50.0}],
-            columns=["Name", "X/Lon", "Y/Lat", "Z"]
-        )
+        st.session_state.gps_data = initial_frame("gps")
         
-    gps_df = st.data_editor(st.session_state.gps_data, num_rows="dynamic")
+    gps_df = st.data_editor(st.session_state.gps_data, key="gps_editor", num_rows="dynamic")
     
     if st.button("Convert Coords"):
         try:
-            points = []
-            for _, row in gps_df.iterrows():
-                points.append((float(row["X/Lon"]), float(row["Y/Lat"]), float(row["Z"])))
+            points = np.column_stack((
+                gps_df["X/Lon"].to_numpy(dtype=np.float64),
+                gps_df["Y/Lat"].to_numpy(dtype=np.float64),
+                gps_df["Z"].to_numpy(dtype=np.float64),
+            ))
             
             converted = convert_coords(points, from_epsg, to_epsg)
             
             res_df = gps_df.copy()
-            res_df["Out X"] = [c[0] for c in converted]
-            res_df["Out Y"] = [c[1] for c in converted]
-            res_df["Out Z"] = [c[2] for c in converted]
+            res_df["Out X"] = converted[:, 0]
+            res_df["Out Y"] = converted[:, 1]
+            res_df["Out Z"] = converted[:, 2]
             
             st.dataframe(res_df)
             
             # Map Preview (if converting to WGS84 or if input is WGS84)
-            map_points = []
+            map_points = np.empty((0, 2))
             if from_epsg == 4326:
-                map_points = [(p[1], p[0]) for p in points] # Lat, Lon
+                map_points = points[:, 1::-1] # Lat, Lon
             elif to_epsg == 4326:
-                map_points = [(c[1], c[0]) for c in converted]
+                map_points = converted[:, 1::-1]
             
-            if map_points and FOLIUM_AVAILABLE:
+            if len(map_points) and FOLIUM_AVAILABLE:
+                import folium
+                from streamlit_folium import st_folium
                 st.subheader("Map Preview")
-                avg_lat = sum(p[0] for p in map_points)/len(map_points)
-                avg_lon = sum(p[1] for p in map_points)/len(map_points)
+                avg_lat, avg_lon = map_points.mean(axis=0)
                 m = folium.Map(location=[avg_lat, avg_lon], zoom_start=15)
-                for i, mp in enumerate(map_points):
+                for i, mp in enumerate(map_points.tolist()):
                     folium.Marker(mp, popup=f"P{i}").add_to(m)
                 st_folium(m, height=400, use_container_width=True)
                 
@@ -0,0 +1,411 @@
+"""
+Regression tests for the vectorised / compiled calculation paths and the
+table models behind the desktop tabs.
+
+Each fast path is compared against a plain scalar reference, with numba and
+numexpr switched off where a module has a fallback. Run with:
+    python -m unittest tests
+"""
+import copy
+import math
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from core import adjustments, calculations, triangulation, trigonometric_leveling
+from core.adjustments import adjust_traverse_bowditch, traverse_bowditch
+from core.calculations import (
+    calculate_coordinates, calculate_lat_dep, dd_to_dms, dd_to_dms_array, dms_to_dd, dms_to_dd_array,
+)
+from core.leveling import calculate_levels
+from core.triangulation import (
+    adjust_network_least_squares, calculate_intersection, calculate_intersections_batch,
+)
+from core.trigonometric_leveling import calculate_trig_levels, calculate_trig_levels_batch
+
+try:
+    from ui.compass_model import INPUT_COLUMN_COUNT, TRAVERSE_COLUMNS, TraverseModel
+    PYQT6_AVAILABLE = True
+except ImportError:
+    PYQT6_AVAILABLE = False
+
+
+def make_network(seed=3, n_stations=6, n_fixed=2, noise=0.5):
+    """
+    Distance-only network: true coordinates, perturbed starting stations and
+    exact distance observations between every pair.
+    """
+    rng = np.random.default_rng(seed)
+    truth = {f"S{i}": (float(rng.uniform(0, 1000)), float(rng.uniform(0, 1000))) for i in range(n_stations)}
+    names = list(truth)
+    observations = []
+    for i, a in enumerate(names):
+        for b in names[i + 1:]:
+            (ea, na), (eb, nb) = truth[a], truth[b]
+            observations.append({'type': 'distance', 'from': a, 'to': b,
+                                 'value': math.hypot(eb - ea, nb - na), 'sd': 0.01})
+    stations = {name: {'e': e, 'n': n, 'fixed': i < n_fixed} for i, (name, (e, n)) in enumerate(truth.items())}
+    for name in names[n_fixed:]:
+        stations[name]['e'] += float(rng.normal(0, noise))
+        stations[name]['n'] += float(rng.normal(0, noise))
+    return truth, stations, observations
+
+
+def reference_fill_distance_rows(dist, sin_az, cos_az, col_from, col_to, obs_pair, obs_value, A, L):
+    for k in range(obs_value.shape[0]):
+        p = obs_pair[k]
+        L[k] = obs_value[k] - dist[p]
+        if col_from[p] >= 0:
+            A[k, col_from[p]] = -sin_az[p]
+            A[k, col_from[p] + 1] = -cos_az[p]
+        if col_to[p] >= 0:
+            A[k, col_to[p]] = sin_az[p]
+            A[k, col_to[p] + 1] = cos_az[p]
+
+
+ANGLES = ["45.3000", "45.30", "120.1530", "359.5959", "0.0001", "7", 12.5, "90", "-12.3045",
+          "abc", "", "12.30.15", "180.45"]
+
+
+def reference_levels(start, backsights, foresights):
+    """Row-by-row height of instrument reduction."""
+    hi = []
+    elevations = [start]
+    current_hi = None
+    for i, (bs, fs) in enumerate(zip(backsights, foresights)):
+        if i == 0:
+            current_hi = start + bs
+        elif bs > 0:
+            current_hi = elevations[i] + bs
+        hi.append(current_hi)
+        elevations.append(current_hi - fs)
+    return hi, elevations
+
+
+def reference_trig(station_elev, hi, hd, va, th):
+    alpha = math.radians(90 - dms_to_dd(va))
+    cr = 0.0675 * (hd / 1000.0) ** 2
+    return station_elev + hd * math.tan(alpha) + hi - th + cr, cr
+
+
+class JacobianFillTests(unittest.TestCase):
+    def test_fill_distance_rows_matches_loop(self):
+        rng = np.random.default_rng(11)
+        n_pairs, n_obs, n_unknowns = 6, 10, 8
+        dist = rng.uniform(10, 100, n_pairs)
+        sin_az, cos_az = rng.uniform(-1, 1, n_pairs), rng.uniform(-1, 1, n_pairs)
+        col_from = np.array([0, -1, 2, 4, -1, 6])
+        col_to = np.array([2, 0, -1, 6, 4, -1])
+        obs_pair = rng.integers(0, n_pairs, n_obs)
+        obs_value = rng.uniform(10, 100, n_obs)
+
+        A_ref, L_ref = np.zeros((n_obs, n_unknowns)), np.zeros(n_obs)
+        reference_fill_distance_rows(dist, sin_az, cos_az, col_from, col_to, obs_pair, obs_value, A_ref, L_ref)
+        for numba in sorted({False, triangulation.NUMBA_AVAILABLE}):
+            A, L = np.zeros((n_obs, n_unknowns)), np.zeros(n_obs)
+            with mock.patch.object(triangulation, "NUMBA_AVAILABLE", numba):
+                triangulation._fill_distance_rows(dist, sin_az, cos_az, col_from, col_to, obs_pair, obs_value, A, L)
+            np.testing.assert_array_equal(A, A_ref)
+            np.testing.assert_array_equal(L, L_ref)
+
+    def test_adjustment_without_numba_matches(self):
+        _, stations, observations = make_network()
+        expected = adjust_network_least_squares(copy.deepcopy(stations), observations)
+        with mock.patch.object(triangulation, "NUMBA_AVAILABLE", False):
+            got = adjust_network_least_squares(copy.deepcopy(stations), observations)
+        for name in expected:
+            self.assertAlmostEqual(got[name]['e'], expected[name]['e'], places=9)
+            self.assertAlmostEqual(got[name]['n'], expected[name]['n'], places=9)
+
+
+class DmsToDdArrayTests(unittest.TestCase):
+    def test_matches_scalar(self):
+        result = dms_to_dd_array(ANGLES)
+        for value, got in zip(ANGLES, result):
+            expected = dms_to_dd(value)
+            if expected is None:
+                self.assertTrue(np.isnan(got), value)
+            else:
+                self.assertAlmostEqual(got, expected, places=12, msg=value)
+
+    def test_dms_string_semantics(self):
+        # Four or more digits after the point are MMSS, fewer are already decimal
+        np.testing.assert_allclose(dms_to_dd_array(["45.3000", "45.30"]), [45.5, 45.3])
+
+    def test_empty(self):
+        self.assertEqual(dms_to_dd_array([]).shape, (0,))
+
+
+class IntersectionTests(unittest.TestCase):
+    def test_batch_matches_scalar(self):
+        alphas = ["45.3015", "30.0000", "60.1020", "12.0545"]
+        betas = ["60.1020", "75.3000", "40.0000", "100.0000"]
+        directions = ["Left", "left", "Right", "RIGHT"]
+        eC, nC = calculate_intersections_batch(1000.0, 2000.0, 1500.0, 2100.0, alphas, betas, directions)
+        for i, (a, b, d) in enumerate(zip(alphas, betas, directions)):
+            e, n = calculate_intersection(1000.0, 2000.0, 1500.0, 2100.0, a, b, d)
+            self.assertAlmostEqual(eC[i], e, places=9)
+            self.assertAlmostEqual(nC[i], n, places=9)
+
+    def test_intersection_geometry(self):
+        # Equilateral triangle on a 100 m east-going baseline, apex to the left (north)
+        e, n = calculate_intersection(0.0, 0.0, 100.0, 0.0, "60.0000", "60.0000", "Left")
+        self.assertAlmostEqual(e, 50.0, places=9)
+        self.assertAlmostEqual(n, 100.0 * math.sqrt(3) / 2, places=9)
+
+    def test_invalid_angles_raise(self):
+        with self.assertRaises(ValueError):
+            calculate_intersection(0.0, 0.0, 100.0, 0.0, "abc", "60.0000")
+        with self.assertRaises(ValueError):
+            calculate_intersections_batch(0.0, 0.0, 100.0, 0.0, ["abc"], ["60.0000"], ["Left"])
+
+    def test_angle_sum_too_large_raises(self):
+        with self.assertRaises(ValueError):
+            calculate_intersection(0.0, 0.0, 100.0, 0.0, "100.0000", "80.0000")
+        with self.assertRaises(ValueError):
+            calculate_intersections_batch(0.0, 0.0, 100.0, 0.0, ["100.0000"], ["80.0000"], ["Left"])
+
+
+class DdToDmsArrayTests(unittest.TestCase):
+    def test_matches_scalar(self):
+        values = [0.0, 45.5, 120.258333333, 359.9999999, -12.5125, 0.000277, 89.99999]
+        self.assertEqual(dd_to_dms_array(values).tolist(), [dd_to_dms(v) for v in values])
+
+    def test_empty(self):
+        self.assertEqual(dd_to_dms_array([]).shape, (0,))
+
+
+class LeastSquaresTests(unittest.TestCase):
+    def setUp(self):
+        self.truth, self.stations, self.observations = make_network()
+
+    def adjust(self, **kwargs):
+        return adjust_network_least_squares(copy.deepcopy(self.stations), self.observations, **kwargs)
+
+    def test_recovers_true_coordinates(self):
+        # Iteration stops once every distance misclosure is under tol
+        adjusted = self.adjust(tol=1e-6)
+        for name, (e, n) in self.truth.items():
+            self.assertAlmostEqual(adjusted[name]['e'], e, places=4)
+            self.assertAlmostEqual(adjusted[name]['n'], n, places=4)
+
+    def test_fixed_stations_do_not_move(self):
+        adjusted = self.adjust()
+        for name in ("S0", "S1"):
+            self.assertEqual(adjusted[name]['e'], self.stations[name]['e'])
+            self.assertEqual(adjusted[name]['n'], self.stations[name]['n'])
+
+    def test_loose_tolerance_stops_before_solving(self):
+        adjusted = self.adjust(tol=1e9)
+        self.assertEqual(adjusted, self.stations)
+
+    def test_no_free_stations(self):
+        stations = {name: dict(data, fixed=True) for name, data in self.stations.items()}
+        self.assertIs(adjust_network_least_squares(stations, self.observations), stations)
+
+
+class LevelingTests(unittest.TestCase):
+    def test_matches_row_by_row_reduction(self):
+        bs = [1.512, 0.0, 2.004, 0.0, 1.118, 0.0]
+        fs = [0.0, 1.234, 0.875, 1.900, 0.0, 2.311]
+        hi, elevations = calculate_levels(100.0, bs, fs)
+        ref_hi, ref_elevations = reference_levels(100.0, bs, fs)
+        np.testing.assert_allclose(hi, ref_hi, atol=1e-12)
+        np.testing.assert_allclose(elevations, ref_elevations, atol=1e-12)
+        self.assertEqual(len(elevations), len(bs) + 1)
+
+    def test_empty_run(self):
+        hi, elevations = calculate_levels(50.0, [], [])
+        self.assertEqual(hi.size, 0)
+        np.testing.assert_array_equal(elevations, [50.0])
+
+
+class CombineDmsTests(unittest.TestCase):
+    def setUp(self):
+        self.degrees = np.array([0.0, 45.0, 359.0, -12.0])
+        self.mmss = np.array([1.0, 3000.0, 5959.0, 3045.0])
+
+    def test_numpy_matches_scalar(self):
+        expected = [calculations._combine_dms_scalar(d, m) for d, m in zip(self.degrees, self.mmss)]
+        np.testing.assert_allclose(calculations._combine_dms(self.degrees, self.mmss), expected, rtol=0, atol=1e-12)
+
+    @unittest.skipUnless(calculations.NUMBA_AVAILABLE, "numba not installed")
+    def test_jit_matches_numpy(self):
+        np.testing.assert_allclose(calculations._combine_dms_jit()(self.degrees, self.mmss),
+                                   calculations._combine_dms(self.degrees, self.mmss), rtol=0, atol=1e-12)
+
+    def test_dms_to_dd_array_without_numba(self):
+        expected = dms_to_dd_array(ANGLES)
+        with mock.patch.object(calculations, "NUMBA_AVAILABLE", False):
+            np.testing.assert_array_equal(dms_to_dd_array(ANGLES), expected)
+
+
+class TraverseTests(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.azimuths = rng.uniform(0, 360, 25)
+        self.distances = rng.uniform(10, 300, 25)
+
+    def test_lat_dep_matches_scalar(self):
+        lats, deps = calculate_lat_dep(self.azimuths, self.distances)
+        for az, d, lat, dep in zip(self.azimuths, self.distances, lats, deps):
+            self.assertAlmostEqual(lat, d * math.cos(math.radians(az)), places=9)
+            self.assertAlmostEqual(dep, d * math.sin(math.radians(az)), places=9)
+
+    def test_traverse_bowditch_matches_step_by_step(self):
+        lats, deps = calculate_lat_dep(self.azimuths, self.distances)
+        adj_lat, adj_dep, _, _ = adjust_traverse_bowditch(self.distances, lats, deps)
+        coords = calculate_coordinates(1000.0, 5000.0, adj_lat, adj_dep)
+
+        for numba in sorted({False, adjustments.NUMBA_AVAILABLE}):
+            with mock.patch.object(adjustments, "NUMBA_AVAILABLE", numba):
+                got_lat, got_dep, got_coords = traverse_bowditch(1000.0, 5000.0, self.azimuths, self.distances)
+            np.testing.assert_allclose(got_lat, lats, atol=1e-9)
+            np.testing.assert_allclose(got_dep, deps, atol=1e-9)
+            np.testing.assert_allclose(got_coords, coords, atol=1e-6)
+
+    def test_bowditch_closes_the_loop(self):
+        lats, deps = calculate_lat_dep(self.azimuths, self.distances)
+        adj_lat, adj_dep, _, _ = adjust_traverse_bowditch(self.distances, lats, deps)
+        self.assertAlmostEqual(adj_lat.sum(), 0.0, places=8)
+        self.assertAlmostEqual(adj_dep.sum(), 0.0, places=8)
+
+    def test_bowditch_zero_length(self):
+        zeros = np.zeros(3)
+        _, _, lat_corr, dep_corr = adjust_traverse_bowditch(zeros, [1.0, 2.0, 3.0], [1.0, 1.0, 1.0])
+        np.testing.assert_array_equal(lat_corr, zeros)
+        np.testing.assert_array_equal(dep_corr, zeros)
+
+    def test_coordinates_start_point(self):
+        coords = calculate_coordinates(1000.0, 5000.0, [1.0, 2.0], [3.0, 4.0])
+        np.testing.assert_array_equal(coords, [[5000.0, 1000.0], [5003.0, 1001.0], [5007.0, 1003.0]])
+
+
+class NumexprPathTests(unittest.TestCase):
+    def setUp(self):
+        if not calculations.NUMEXPR_AVAILABLE:
+            self.skipTest("numexpr not installed")
+
+    def test_lat_dep(self):
+        rng = np.random.default_rng(5)
+        azimuths, distances = rng.uniform(0, 360, 50), rng.uniform(10, 300, 50)
+        expected = calculate_lat_dep(azimuths, distances)
+        with mock.patch.object(calculations, "NUMEXPR_MIN_SIZE", 0):
+            got = calculate_lat_dep(azimuths, distances)
+        np.testing.assert_allclose(got, expected, rtol=1e-12)
+
+    def test_trig_levels(self):
+        args = (100.0, 1.55, [125.5, 310.2, 1500.0], ["88.3015", "91.1245", "87.0030"], [1.5, 1.8, 2.1])
+        with mock.patch.object(trigonometric_leveling, "NUMBA_AVAILABLE", False), \
+                mock.patch.object(trigonometric_leveling, "NUMEXPR_AVAILABLE", False):
+            expected = trigonometric_leveling.calculate_trig_levels_batch(*args)
+        with mock.patch.object(trigonometric_leveling, "NUMBA_AVAILABLE", False), \
+                mock.patch.object(trigonometric_leveling, "NUMEXPR_MIN_SIZE", 0):
+            got = trigonometric_leveling.calculate_trig_levels_batch(*args)
+        np.testing.assert_allclose(got, expected, rtol=1e-12)
+
+
+class TrigLevelingTests(unittest.TestCase):
+    def setUp(self):
+        self.hd = [125.5, 310.2, 48.0, 1500.0]
+        self.va = ["88.3015", "91.1245", "90.0000", "87.0030"]
+        self.th = [1.5, 1.8, 0.0, 2.1]
+
+    def calculate(self):
+        return calculate_trig_levels_batch(100.0, 1.55, self.hd, self.va, self.th)
+
+    def assert_matches_reference(self, elev, cr):
+        for i, (hd, va, th) in enumerate(zip(self.hd, self.va, self.th)):
+            ref_elev, ref_cr = reference_trig(100.0, 1.55, hd, va, th)
+            self.assertAlmostEqual(elev[i], ref_elev, places=9)
+            self.assertAlmostEqual(cr[i], ref_cr, places=12)
+
+    def test_batch_matches_scalar(self):
+        self.assert_matches_reference(*self.calculate())
+
+    def test_numpy_path(self):
+        with mock.patch.object(trigonometric_leveling, "NUMBA_AVAILABLE", False), \
+                mock.patch.object(trigonometric_leveling, "NUMEXPR_AVAILABLE", False):
+            self.assert_matches_reference(*self.calculate())
+
+    def test_invalid_angle_raises(self):
+        with self.assertRaises(ValueError):
+            calculate_trig_levels_batch(100.0, 1.55, [10.0], ["abc"], [1.0])
+
+    def test_list_wrapper(self):
+        observations = [{'target': f"T{i}", 'hd': hd, 'va': va, 'th': th}
+                        for i, (hd, va, th) in enumerate(zip(self.hd, self.va, self.th))]
+        results = calculate_trig_levels(100.0, 1.55, observations)
+        self.assertEqual([r['target'] for r in results], ["T0", "T1", "T2", "T3"])
+        self.assert_matches_reference([r['elevation'] for r in results], [r['cr'] for r in results])
+        self.assertEqual(calculate_trig_levels(100.0, 1.55, []), [])
+
+
+@unittest.skipUnless(PYQT6_AVAILABLE, "PyQt6 not installed")
+class TraverseModelTests(unittest.TestCase):
+    def cell(self, model, row, col):
+        return model.data(model.index(row, col))
+
+    def test_load_matches_header_then_name_then_position(self):
+        model = TraverseModel()
+        model.set_header(1, "Azimuth (Decimal)")
+        df = pd.DataFrame({
+            "Distance (m)": ["10.5", "20.25"],           # by name, out of order
+            "Azimuth (DD.MMSS)": ["1.0000", "2.0000"],   # canonical name, loses to the header
+            "Azimuth (Decimal)": ["45.5", "90.25"],      # current header
+            "Lat": [1.0, 2.0],                           # unknown name, column 3 by position
+        })
+        model.load(df)
+        self.assertEqual(model.rowCount(), 2)
+        self.assertEqual(self.cell(model, 0, 1), "45.5")
+        self.assertEqual(self.cell(model, 1, 2), "20.25")
+        self.assertEqual(self.cell(model, 1, 3), "2.0000")
+        # Column 0 falls back to position 0, which is the distance column here
+        self.assertEqual(self.cell(model, 0, 0), "10.5")
+        # Nothing left for the remaining result columns
+        self.assertEqual(self.cell(model, 0, 4), "")
+
+    def test_load_keeps_input_text_and_blanks_missing_values(self):
+        model = TraverseModel()
+        model.load(pd.DataFrame({"Line": ["A-B", None], "Azimuth (DD.MMSS)": ["45.3000", "90.0000"]}))
+        self.assertEqual(self.cell(model, 0, 1), "45.3000")
+        self.assertEqual(self.cell(model, 1, 0), "")
+
+    def test_set_results_writes_leading_rows(self):
+        model = TraverseModel(rows=3)
+        columns = [np.array([1.0, 2.0]) + i for i in range(len(TRAVERSE_COLUMNS) - INPUT_COLUMN_COUNT)]
+        model.set_results(columns)
+        self.assertEqual(self.cell(model, 0, INPUT_COLUMN_COUNT), "1.0000")
+        self.assertEqual(self.cell(model, 1, len(TRAVERSE_COLUMNS) - 1), f"{2.0 + len(columns) - 1:.4f}")
+        self.assertEqual(self.cell(model, 2, INPUT_COLUMN_COUNT), "")
+        model.set_results([np.array([])])  # no rows: nothing to write
+        self.assertEqual(self.cell(model, 0, INPUT_COLUMN_COUNT), "1.0000")
+
+    def test_set_data_rejects_non_numeric_results(self):
+        model = TraverseModel(rows=1)
+        result_index = model.index(0, INPUT_COLUMN_COUNT)
+        self.assertTrue(model.setData(result_index, "12.5"))
+        self.assertFalse(model.setData(result_index, "abc"))
+        self.assertEqual(model.data(result_index), "12.5000")
+        self.assertTrue(model.setData(result_index, ""))
+        self.assertEqual(model.data(result_index), "")
+        self.assertTrue(model.setData(model.index(0, 1), "45.3000"))
+        self.assertEqual(self.cell(model, 0, 1), "45.3000")
+
+    def test_to_dataframe_drops_unnamed_rows(self):
+        model = TraverseModel(rows=3)
+        for row, line in enumerate(["A-B", "", "C-D"]):
+            model.setData(model.index(row, 0), line)
+        model.set_results([np.array([1.23456, 2.0, np.nan])])
+        model.set_header(1, "Azimuth (Decimal)")
+        df = model.to_dataframe()
+        self.assertEqual(df.iloc[:, 0].tolist(), ["A-B", "C-D"])
+        self.assertEqual(list(df.columns)[1], "Azimuth (Decimal)")
+        # Results are exported as the table shows them
+        self.assertEqual(df.iloc[:, INPUT_COLUMN_COUNT].tolist(), ["1.2346", ""])
+
+
+if __name__ == "__main__":
+    unittest.main()
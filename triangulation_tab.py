@@ -1,8 +1,10 @@
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGroupBox, QTableWidget, QTableWidgetItem,
-    QPushButton, QLabel, QDoubleSpinBox, QHeaderView, QMessageBox, QComboBox
+    QPushButton, QLabel, QDoubleSpinBox, QHeaderView, QMessageBox, QComboBox, QTableView
 )
+import numpy as np
 from core.triangulation import calculate_simple_triangulation
+from ui.results_model import ResultsTableModel
 
 class TriangulationTab(QWidget):
     def __init__(self):
@@ -48,9 +50,9 @@ class TriangulationTab(QWidget):
         layout.addLayout(btn_layout)
 
         # Results
-        self.res_table = QTableWidget()
-        self.res_table.setColumnCount(3)
-        self.res_table.setHorizontalHeaderLabels(["Station", "Easting", "Northing"])
+        self.res_model = ResultsTableModel(["Station", "Easting", "Northing"])
+        self.res_table = QTableView()
+        self.res_table.setModel(self.res_model)
         self.res_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         layout.addWidget(self.res_table)
         
@@ -90,11 +92,10 @@ class TriangulationTab(QWidget):
                 self.base_dist.value(), str(self.base_az.value()), triangles
             )
             
-            self.res_table.setRowCount(len(stations))
-            for i, (name, coords) in enumerate(stations.items()):
-                self.res_table.setItem(i, 0, QTableWidgetItem(name))
-                self.res_table.setItem(i, 1, QTableWidgetItem(f"{coords[0]:.3f}"))
-                self.res_table.setItem(i, 2, QTableWidgetItem(f"{coords[1]:.3f}"))
+            # Format all coordinates at once and hand the rows to the model in one reset
+            coords = np.array(list(stations.values()), dtype=float).reshape(-1, 2)
+            formatted = np.char.mod("%.3f", coords)
+            self.res_model.update(zip(stations, formatted[:, 0].tolist(), formatted[:, 1].tolist()))
                 
         except Exception as e:
             QMessageBox.critical(self, "Error", str(e))
\ No newline at end of file
@@ -1,8 +1,10 @@
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGroupBox, QTableWidget, QTableWidgetItem,
-    QPushButton, QLabel, QDoubleSpinBox, QHeaderView, QMessageBox
+    QPushButton, QLabel, QDoubleSpinBox, QHeaderView, QMessageBox, QTableView
 )
-from core.trigonometric_leveling import calculate_trig_levels
+import numpy as np
+from core.trigonometric_leveling import calculate_trig_levels_batch
+from ui.results_model import ResultsTableModel
 
 class TrigLevelingTab(QWidget):
     def __init__(self):
@@ -58,9 +60,9 @@ class TrigLevelingTab(QWidget):
         
         res_group = QGroupBox("Results")
         res_layout = QVBoxLayout(res_group)
-        self.res_table = QTableWidget()
-        self.res_table.setColumnCount(2)
-        self.res_table.setHorizontalHeaderLabels(["Target", "Elevation"])
+        self.res_model = ResultsTableModel(["Target", "Elevation"])
+        self.res_table = QTableView()
+        self.res_table.setModel(self.res_model)
         self.res_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         res_layout.addWidget(self.res_table)
         right_layout.addWidget(res_group)
@@ -78,20 +80,13 @@ class TrigLevelingTab(QWidget):
         self.table.setItem(r, 3, QTableWidgetItem("0.00"))
 
     def calculate(self):
-        obs_list = []
         try:
-            for r in range(self.table.rowCount()):
-                t = self.table.item(r, 0).text()
-                hd = self.table.item(r, 1).text()
-                va = self.table.item(r, 2).text()
-                th = self.table.item(r, 3).text()
-                obs_list.append({'target': t, 'hd': hd, 'va': va, 'th': th})
-            
-            results = calculate_trig_levels(self.stn_elev.value(), self.hi.value(), obs_list)
+            # Read each table column once and hand the columns to the batch calculation
+            columns = [[self.table.item(r, c).text() for r in range(self.table.rowCount())] for c in range(4)]
+            targets, hd, va, th = columns
+
+            elevations, _ = calculate_trig_levels_batch(self.stn_elev.value(), self.hi.value(), hd, va, th)
             
-            self.res_table.setRowCount(len(results))
-            for i, res in enumerate(results):
-                self.res_table.setItem(i, 0, QTableWidgetItem(res['target']))
-                self.res_table.setItem(i, 1, QTableWidgetItem(f"{res['elevation']:.4f}"))
+            self.res_model.update(zip(targets, np.char.mod("%.4f", elevations).tolist()))
         except Exception as e:
             QMessageBox.critical(self, "Error", str(e))
\ No newline at end of file
@@ -0,0 +1,35 @@
+# Shared styling for the tabs' action buttons
+from functools import lru_cache
+from PyQt6.QtGui import QColor
+from PyQt6.QtWidgets import QPushButton
+
+_BTN_STYLE_TPL = """
+    QPushButton {{
+        background-color: {bg};
+        color: {text};
+        border-radius: 5px;
+        padding: 10px;
+        font-size: 14px;
+        font-weight: bold;
+    }}
+    QPushButton:hover {{
+        background-color: {hover};
+    }}
+"""
+
+@lru_cache(maxsize=64)
+def darken_color(color_str, factor=0.85):
+    """Darkens a hex color string."""
+    # QColor.darker() takes an integer percentage (100-400). 100/0.85 is ~117.
+    return QColor(color_str).darker(int(100 / factor)).name()
+
+@lru_cache(maxsize=64)
+def button_style(bg_color, text_color="#FFFFFF"):
+    """Builds the stylesheet for one colour pair; each pair is only built once."""
+    return _BTN_STYLE_TPL.format(bg=bg_color, text=text_color, hover=darken_color(bg_color))
+
+def create_styled_button(text, bg_color, text_color="#FFFFFF"):
+    """Factory function to create a styled QPushButton."""
+    button = QPushButton(text)
+    button.setStyleSheet(button_style(bg_color, text_color))
+    return button
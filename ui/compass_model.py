@@ -0,0 +1,165 @@
+# Editable table model for the compass traverse
+import numpy as np
+import pandas as pd
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+TRAVERSE_COLUMNS = [
+    "Line", "Azimuth (DD.MMSS)", "Distance (m)",
+    "Latitude", "Departure", "Lat. Corr. (m)", "Dep. Corr. (m)",
+    "Adj. Easting (m)", "Adj. Northing (m)"
+]
+
+# The first three columns are typed in by the user; the rest are calculated
+INPUT_COLUMN_COUNT = 3
+
+# CSV column types for import. Input columns are read as text so DD.MMSS values
+# keep their trailing zeros; both azimuth header variants are listed.
+TRAVERSE_DTYPES = {
+    name: (str if i < INPUT_COLUMN_COUNT else np.float64)
+    for i, name in enumerate(TRAVERSE_COLUMNS)
+}
+TRAVERSE_DTYPES["Azimuth (Decimal)"] = str
+
+class TraverseModel(QAbstractTableModel):
+    """
+    Keeps the traverse table in a single pandas DataFrame for a QTableView.
+
+    Input columns hold the text the user typed, result columns are float64 and
+    are only formatted when the view asks for a visible cell.
+    """
+    def __init__(self, rows=5, parent=None):
+        super().__init__(parent)
+        self._headers = list(TRAVERSE_COLUMNS)
+        self._df = self._empty_frame(rows)
+
+    @staticmethod
+    def _empty_frame(rows):
+        data = {}
+        for i, name in enumerate(TRAVERSE_COLUMNS):
+            if i < INPUT_COLUMN_COUNT:
+                data[name] = np.full(rows, "", dtype=object)
+            else:
+                data[name] = np.full(rows, np.nan)
+        return pd.DataFrame(data)
+
+    def dataframe(self):
+        """Returns the backing DataFrame. Callers must not modify it in place."""
+        return self._df
+
+    def to_dataframe(self):
+        """
+        Returns a copy of the rows that have a line name, under the current headers.
+
+        Result columns are formatted the way the view shows them ("%.4f", blank
+        for NaN), so exported files hold the same text as the table.
+        """
+        df = self._df[self._df.iloc[:, 0] != ""].reset_index(drop=True)
+        for name in TRAVERSE_COLUMNS[INPUT_COLUMN_COUNT:]:
+            values = df[name].to_numpy()
+            df[name] = np.where(np.isnan(values), "", np.char.mod("%.4f", values))
+        df.columns = list(self._headers)
+        return df
+
+    def set_header(self, column, text):
+        """Changes the label shown for one column."""
+        self._headers[column] = text
+        self.headerDataChanged.emit(Qt.Orientation.Horizontal, column, column)
+
+    def load(self, df):
+        """
+        Replaces the table contents with a DataFrame.
+
+        Columns are matched by name, falling back to the same position, and
+        anything missing is left empty.
+        """
+        frame = self._empty_frame(len(df))
+        df_columns = list(df.columns)
+        for col_idx, col_name in enumerate(TRAVERSE_COLUMNS):
+            header = self._headers[col_idx]
+            if header in df_columns:
+                source = df[header]
+            elif col_name in df_columns:
+                source = df[col_name]
+            elif col_idx < len(df_columns):
+                source = df.iloc[:, col_idx]
+            else:
+                continue
+            if col_idx < INPUT_COLUMN_COUNT:
+                frame[col_name] = source.astype(str).where(source.notna(), "").to_numpy(dtype=object)
+            else:
+                frame[col_name] = pd.to_numeric(source, errors='coerce').to_numpy(dtype=np.float64)
+
+        self.beginResetModel()
+        self._df = frame
+        self.endResetModel()
+
+    def set_results(self, columns):
+        """
+        Writes calculated values into the result columns in one go.
+
+        Args:
+            columns (list): One array per result column, each covering the
+                first len(array) rows of the table.
+        """
+        n = len(columns[0])
+        if n == 0:
+            return
+        for offset, values in enumerate(columns):
+            col = INPUT_COLUMN_COUNT + offset
+            self._df.iloc[:n, col] = np.asarray(values, dtype=np.float64)
+        self.dataChanged.emit(
+            self.index(0, INPUT_COLUMN_COUNT),
+            self.index(n - 1, INPUT_COLUMN_COUNT + len(columns) - 1),
+        )
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._df)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._headers)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return None
+        value = self._df.iat[index.row(), index.column()]
+        if index.column() < INPUT_COLUMN_COUNT:
+            return value
+        return "" if np.isnan(value) else f"{value:.4f}"
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if role != Qt.ItemDataRole.EditRole or not index.isValid():
+            return False
+        if index.column() < INPUT_COLUMN_COUNT:
+            self._df.iat[index.row(), index.column()] = str(value)
+        else:
+            try:
+                self._df.iat[index.row(), index.column()] = float(value) if str(value).strip() else np.nan
+            except ValueError:
+                return False
+        self.dataChanged.emit(index, index, [role])
+        return True
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsEditable
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self._headers[section]
+        return super().headerData(section, orientation, role)
+
+    def insertRows(self, row, count, parent=QModelIndex()):
+        self.beginInsertRows(parent, row, row + count - 1)
+        self._df = pd.concat(
+            [self._df.iloc[:row], self._empty_frame(count), self._df.iloc[row:]],
+            ignore_index=True,
+        )
+        self.endInsertRows()
+        return True
+
+    def removeRows(self, row, count, parent=QModelIndex()):
+        self.beginRemoveRows(parent, row, row + count - 1)
+        self._df = self._df.drop(index=range(row, row + count)).reset_index(drop=True)
+        self.endRemoveRows()
+        return True
@@ -6,20 +6,21 @@ from PyQt6.QtWidgets import (
     QVBoxLayout,
     QCheckBox,
     QGroupBox,
-    QTableWidget,
+    QTableView,
     QPushButton,
     QComboBox,
     QHeaderView,
     QLabel,
     QFileDialog,
     QMessageBox,
-    QTableWidgetItem,
     QInputDialog,
     QScrollArea,
     QTabWidget,
     QLineEdit,
+    QProgressDialog,
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QThreadPool
+from functools import lru_cache
 import numpy as np
 
 FOLIUM_ERROR = None
@@ -39,16 +40,65 @@ except ImportError as e:
     WEB_ENGINE_ERROR = str(e)
 
 # Import data service functions
-from data_services.csv_handler import import_csv_to_dataframe, export_dataframe_to_csv
-from data_services.pdf_reporter import generate_traverse_report
-from data_services.kml_exporter import export_to_kml
+from data_services.csv_handler import export_dataframe_to_csv
 
 # Import calculation and adjustment functions
-from core.calculations import dms_to_dd, calculate_lat_dep, calculate_coordinates
+from core.calculations import dms_to_dd_array, calculate_lat_dep, calculate_coordinates
 from core.adjustments import adjust_traverse_bowditch
-from core.coordinate_converter import convert_to_global
-import pandas as pd
-from .plot_widget import PlotWidget
+from .compass_model import TraverseModel, TRAVERSE_DTYPES
+from .csv_worker import CsvLoadWorker
+from .button_styles import create_styled_button
+
+# Widest value expected in a column (a 7-digit coordinate to 4 decimals) and
+# the extra room left for cell margins
+COLUMN_WIDTH_SAMPLE = "-0000000.0000"
+COLUMN_PADDING = 16
+
+@lru_cache(maxsize=8)
+def _compute_traverse(bearings_dd, distances, start_easting, start_northing, adjustment_method):
+    """
+    Calculates and adjusts a traverse from hashable inputs.
+
+    The results are cached, so the returned arrays are made read-only and the
+    summary dict must be copied before it is changed.
+
+    Returns:
+        tuple: (latitudes, departures, latitude corrections, departure corrections,
+                adjusted (E, N) coordinates, report summary dict)
+    """
+    distances = np.asarray(distances, dtype=np.float64)
+
+    # Calculate Latitudes and Departures
+    latitudes, departures = calculate_lat_dep(bearings_dd, distances)
+
+    # Misclosures for reporting; the three totals come from one reduction
+    misclosure_lat, misclosure_dep, total_length = np.stack([latitudes, departures, distances]).sum(axis=1)
+    misclosure_linear = np.hypot(misclosure_lat, misclosure_dep)
+
+    if adjustment_method == "Bowditch Method":
+        adj_latitudes, adj_departures, lat_corrections, dep_corrections = adjust_traverse_bowditch(distances, latitudes, departures)
+    else: # No adjustment
+        adj_latitudes, adj_departures = latitudes, departures
+        zero_corrections = np.zeros(len(latitudes))
+        lat_corrections, dep_corrections = zero_corrections, zero_corrections
+
+    # Calculate final adjusted coordinates
+    final_coords = calculate_coordinates(start_northing, start_easting, adj_latitudes, adj_departures)
+
+    summary = {
+        "Adjustment Method": adjustment_method,
+        "Start Northing (m)": f"{start_northing:.4f}",
+        "Start Easting (m)": f"{start_easting:.4f}",
+        "Latitude Misclosure (m)": f"{misclosure_lat:.4f}",
+        "Departure Misclosure (m)": f"{misclosure_dep:.4f}",
+        "Linear Misclosure (m)": f"{misclosure_linear:.4f}",
+        "Total Traverse Length (m)": f"{total_length:.4f}",
+    }
+
+    results = (latitudes, departures, lat_corrections, dep_corrections, final_coords)
+    for arr in results:
+        arr.setflags(write=False)
+    return results + (summary,)
 
 class CompassTab(QWidget):
     def __init__(self):
@@ -75,7 +125,7 @@ class CompassTab(QWidget):
         data_input_group = QGroupBox("Data Input")
         data_layout = QVBoxLayout(data_input_group)
         
-        self.table = QTableWidget()
+        self.table = QTableView()
         self.setup_table()
         data_layout.addWidget(self.table)
 
@@ -96,9 +146,9 @@ class CompassTab(QWidget):
         
         self.viz_tabs = QTabWidget()
         
-        # Tab 1: Plot
-        self.plot_widget = PlotWidget()
-        self.viz_tabs.addTab(self.plot_widget, "Traverse Plot")
+        # Tab 1: Plot, created the first time the plot is shown (see show_plot_widget)
+        self.plot_widget = None
+        self._plot_dirty = False
         
         # Tab 2: Map
         if not FOLIUM_AVAILABLE:
@@ -155,9 +205,9 @@ class CompassTab(QWidget):
         controls_layout.addSpacing(20)
 
         # Action Buttons
-        self.import_csv_button = self.create_styled_button("Import from CSV", "#007BFF")
-        self.calculate_button = self.create_styled_button("Calculate & Adjust", "#28A745")
-        self.save_plot_button = self.create_styled_button("Save Plot", "#17A2B8")
+        self.import_csv_button = create_styled_button("Import from CSV", "#007BFF")
+        self.calculate_button = create_styled_button("Calculate & Adjust", "#28A745")
+        self.save_plot_button = create_styled_button("Save Plot", "#17A2B8")
         
         controls_layout.addWidget(self.import_csv_button)
         controls_layout.addWidget(self.calculate_button)
@@ -174,9 +224,9 @@ class CompassTab(QWidget):
         export_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         controls_layout.addWidget(export_label)
         
-        self.export_csv_button = self.create_styled_button("Export to CSV", "#6C757D")
-        self.export_pdf_button = self.create_styled_button("Export Report (PDF)", "#DC3545")
-        self.export_kml_button = self.create_styled_button("Export for Google Earth (KML)", "#FFC107", text_color="#000000")
+        self.export_csv_button = create_styled_button("Export to CSV", "#6C757D")
+        self.export_pdf_button = create_styled_button("Export Report (PDF)", "#DC3545")
+        self.export_kml_button = create_styled_button("Export for Google Earth (KML)", "#FFC107", text_color="#000000")
 
         controls_layout.addWidget(self.export_csv_button)
         controls_layout.addWidget(self.export_pdf_button)
@@ -196,66 +246,69 @@ class CompassTab(QWidget):
 
     def setup_table(self):
         """Configures the properties of the data input table."""
-        self.table.setColumnCount(9)
-        self.table.setHorizontalHeaderLabels([
-            "Line", "Azimuth (DD.MMSS)", "Distance (m)",
-            "Latitude", "Departure", "Lat. Corr. (m)", "Dep. Corr. (m)",
-            "Adj. Easting (m)", "Adj. Northing (m)"
-        ])
-        header = self.table.horizontalHeader()
-        self.table.setRowCount(5)  # Start with 5 empty rows for manual input
+        self.model = TraverseModel(rows=5)  # Start with 5 empty rows for manual input
+        self.table.setModel(self.model)
+        self.set_column_widths()
         
         # --- Add attributes to store calculation results for reports ---
         self.calculation_summary = {}
         self.final_coords = []
+        # (lon, lat) of final_coords per EPSG code; cleared on every calculation
+        self._global_points_cache = {}
 
     def update_angle_header(self):
         """Updates the table header based on the selected angle type."""
         angle_type = self.angle_type_combo.currentText()
-        self.table.horizontalHeaderItem(1).setText(angle_type)
-
-    def create_styled_button(self, text, bg_color, text_color="#FFFFFF"):
-        """Factory function to create a styled QPushButton."""
-        button = QPushButton(text)
-        button.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {bg_color};
-                color: {text_color};
-                border-radius: 5px;
-                padding: 10px;
-                font-size: 14px;
-                font-weight: bold;
-            }}
-            QPushButton:hover {{
-                background-color: {self.darken_color(bg_color)};
-            }}
-        """)
-        return button
-
-    def darken_color(self, color_str, factor=0.85):
-        """Darkens a hex color string."""
-        from PyQt6.QtGui import QColor
-        color = QColor(color_str)
-        return color.darker(int(100 / factor)).name()
+        if self.model.headerData(1, Qt.Orientation.Horizontal) == angle_type:
+            return
+        self.model.set_header(1, angle_type)
+        self.set_column_widths()
+
+    def set_column_widths(self):
+        """
+        Sizes each column once from its header and a sample value, so Qt does
+        not have to measure every cell the way resizeColumnsToContents does.
+        """
+        metrics = self.table.fontMetrics()
+        sample_width = metrics.horizontalAdvance(COLUMN_WIDTH_SAMPLE)
+        header = self.table.horizontalHeader()
+        for col in range(self.model.columnCount()):
+            label = self.model.headerData(col, Qt.Orientation.Horizontal)
+            width = max(metrics.horizontalAdvance(label), sample_width)
+            header.resizeSection(col, width + COLUMN_PADDING)
 
     def handle_add_row(self):
         """Adds a new empty row to the end of the table."""
-        current_row_count = self.table.rowCount()
-        self.table.insertRow(current_row_count)
+        self.model.insertRows(self.model.rowCount(), 1)
 
     def handle_remove_row(self):
         """Removes the currently selected row from the table."""
-        selected_row = self.table.currentRow()
+        selected_row = self.table.currentIndex().row()
         if selected_row >= 0:
-            self.table.removeRow(selected_row)
+            self.model.removeRows(selected_row, 1)
         else:
             QMessageBox.information(self, "Information", "Please select a row to remove.")
 
     def toggle_plot_visibility(self, state):
         """Shows or hides the plot group based on the checkbox state."""
         is_visible = (state == Qt.CheckState.Checked.value)
+        if is_visible:
+            if self.plot_widget is None:
+                self.show_plot_widget()
+            elif self._plot_dirty:
+                self.plot_widget.plot_traverse(self.final_coords, title="Adjusted Traverse")
+            self._plot_dirty = False
         self.plot_group.setVisible(is_visible)
 
+    def show_plot_widget(self):
+        """Creates the plot tab on first use, so matplotlib is only loaded when needed."""
+        from .plot_widget import PlotWidget
+        self.plot_widget = PlotWidget()
+        self.viz_tabs.insertTab(0, self.plot_widget, "Traverse Plot")
+        self.viz_tabs.setCurrentIndex(0)
+        if len(self.final_coords) > 0:
+            self.plot_widget.plot_traverse(self.final_coords, title="Adjusted Traverse")
+
     def handle_import_csv(self):
         """Opens a file dialog to select a CSV and populates the table with its data."""
         file_path, _ = QFileDialog.getOpenFileName(
@@ -265,40 +318,40 @@ class CompassTab(QWidget):
         if not file_path:
             return # User cancelled the dialog
 
-        df = import_csv_to_dataframe(file_path)
+        # Parse on a pool thread so a large file does not freeze the window
+        self._csv_worker = CsvLoadWorker(file_path, dtype=TRAVERSE_DTYPES)
+        self._csv_worker.signals.finished.connect(self._on_csv_loaded)
+        self._csv_worker.signals.failed.connect(self._on_csv_failed)
 
-        if df is None:
-            QMessageBox.critical(self, "Import Error", "Failed to read or process the CSV file.")
-            return
+        self._csv_progress = QProgressDialog("Loading CSV file...", None, 0, 0, self)
+        self._csv_progress.setWindowTitle("Import CSV")
+        self._csv_progress.setWindowModality(Qt.WindowModality.WindowModal)
+        self._csv_progress.setMinimumDuration(0)
+        self._csv_progress.show()
 
+        QThreadPool.globalInstance().start(self._csv_worker)
+
+    def _on_csv_loaded(self, df):
+        """Receives the parsed DataFrame back on the GUI thread."""
+        self._finish_csv_load()
         self.populate_table_from_dataframe(df)
 
+    def _on_csv_failed(self, message):
+        self._finish_csv_load()
+        QMessageBox.critical(self, "Import Error", message)
+
+    def _finish_csv_load(self):
+        self._csv_progress.close()
+        self._csv_progress = None
+        self._csv_worker = None
+
     def populate_table_from_dataframe(self, df):
         """
-        Clears the table and fills it with data from a pandas DataFrame.
-        Assumes the DataFrame columns match the table's intended columns.
+        Replaces the table contents with data from a pandas DataFrame.
+        Columns are matched by header name, falling back to position, so the
+        CSV columns can be in a different order.
         """
-        self.table.clearContents()
-        self.table.setRowCount(len(df))
-
-        # Map DataFrame columns to table columns by name if possible, or by index
-        # This makes it more robust if CSV columns are in a different order.
-        header_labels = [self.table.horizontalHeaderItem(i).text() for i in range(self.table.columnCount())]
-        
-        for row_idx, row_data in df.iterrows():
-            for col_idx, col_name in enumerate(header_labels):
-                # Try to get data by column name, fall back to index if name doesn't exist in df
-                if col_name in row_data:
-                    item_data = str(row_data[col_name])
-                elif col_idx < len(row_data):
-                    item_data = str(row_data.iloc[col_idx])
-                else:
-                    item_data = "" # No data for this column
-                
-                self.table.setItem(row_idx, col_idx, QTableWidgetItem(item_data))
-        
-        # Resize columns to fit the new content
-        self.table.resizeColumnsToContents()
+        self.model.load(df)
 
         QMessageBox.information(self, "Success", f"Successfully imported {len(df)} rows from the CSV file.")
 
@@ -310,11 +363,11 @@ class CompassTab(QWidget):
             angle_type = self.angle_type_combo.currentText()
 
             if "DD.MMSS" in angle_type:
-                bearings_dd = [dms_to_dd(b) for b in bearings_dms]
+                bearings_dd = dms_to_dd_array(bearings_dms)
             else: # Decimal
-                bearings_dd = [float(b) for b in bearings_dms]
+                bearings_dd = np.asarray(bearings_dms, dtype=float)
 
-            if None in bearings_dd:
+            if np.isnan(bearings_dd).any():
                 raise ValueError("Invalid angle format found. Please check your data and ensure it matches the selected format.")
         except ValueError as e:
             QMessageBox.critical(self, "Input Error", str(e))
@@ -328,41 +381,30 @@ class CompassTab(QWidget):
 
         # 3. Perform the rest of the calculations
         try:
-            # Calculate Latitudes and Departures
-            latitudes, departures = calculate_lat_dep(np.array(bearings_dd), np.array(distances))
-
-            # Store misclosures for reporting
-            misclosure_lat = np.sum(latitudes)
-            misclosure_dep = np.sum(departures)
-
-            # Perform adjustment based on user selection
             adjustment_method = self.adjustment_method_combo.currentText()
-            if adjustment_method == "Bowditch Method":
-                adj_latitudes, adj_departures, lat_corrections, dep_corrections = adjust_traverse_bowditch(distances, latitudes, departures)
-            else: # Placeholder for other methods
+            if adjustment_method != "Bowditch Method": # Placeholder for other methods
                 QMessageBox.warning(self, "Not Implemented", "Least Squares Method is not yet fully implemented. No adjustment has been applied.")
-                adj_latitudes, adj_departures = latitudes, departures
-                zero_corrections = [0.0] * len(latitudes)
-                lat_corrections, dep_corrections = zero_corrections, zero_corrections
 
-            # Calculate final adjusted coordinates
-            self.final_coords = calculate_coordinates(start_northing, start_easting, adj_latitudes, adj_departures)
+            # Identical inputs (e.g. recalculating just to re-export) reuse the previous result
+            latitudes, departures, lat_corrections, dep_corrections, final_coords, summary = _compute_traverse(
+                tuple(bearings_dd.tolist()), tuple(distances.tolist()),
+                start_easting, start_northing, adjustment_method,
+            )
+            if final_coords is not self.final_coords:
+                self._global_points_cache.clear()
+            self.final_coords = final_coords
 
             # Populate the results back into the table
             self.populate_results_in_table(latitudes, departures, lat_corrections, dep_corrections, self.final_coords)
 
             # Store summary for reporting
-            self.calculation_summary = {
-                "Adjustment Method": adjustment_method,
-                "Start Northing (m)": f"{start_northing:.4f}",
-                "Start Easting (m)": f"{start_easting:.4f}",
-                "Latitude Misclosure (m)": f"{misclosure_lat:.4f}",
-                "Departure Misclosure (m)": f"{misclosure_dep:.4f}",
-                "Total Traverse Length (m)": f"{np.sum(distances):.4f}",
-            }
-
-            # Update the plot
-            self.plot_widget.plot_traverse(self.final_coords, title="Adjusted Traverse")
+            self.calculation_summary = dict(summary)
+
+            # Update the plot now if it is on screen, otherwise when it is next shown
+            if self.plot_widget is not None and self.plot_group.isVisible():
+                self.plot_widget.plot_traverse(self.final_coords, title="Adjusted Traverse")
+            else:
+                self._plot_dirty = True
             
             # Update the map
             self.update_map_view(self.final_coords)
@@ -372,28 +414,26 @@ class CompassTab(QWidget):
             QMessageBox.critical(self, "An Error Occurred", f"An unexpected error occurred: {e}")
 
     def read_input_data_from_table(self):
-        """Reads and validates bearing and distance data from the QTableWidget."""
-        bearings = []
-        distances = []
-        # Column indices have changed after removing 'Station'
-        line_col, angle_col, dist_col = 0, 1, 2
-        for row in range(self.table.rowCount()):
-            line_item = self.table.item(row, line_col)
-            bearing_item = self.table.item(row, angle_col)
-            distance_item = self.table.item(row, dist_col)
-
-            # Stop at the first empty row
-            if not (line_item and line_item.text()):
-                break
-
-            if not (bearing_item and bearing_item.text() and distance_item and distance_item.text()):
-                raise ValueError(f"Missing bearing or distance for Line '{line_item.text()}' at row {row + 1}.")
-
-            bearings.append(bearing_item.text().strip())
-            distances.append(float(distance_item.text().strip()))
-
-        if not distances:
+        """Reads and validates bearing and distance data from the table model."""
+        df = self.model.dataframe()
+        lines = df.iloc[:, 0].to_numpy()
+        bearings_col = df.iloc[:, 1].to_numpy()
+        distances_col = df.iloc[:, 2].to_numpy()
+
+        # Stop at the first empty row
+        empty = np.flatnonzero(lines == "")
+        n = empty[0] if empty.size else len(lines)
+
+        missing = np.flatnonzero((bearings_col[:n] == "") | (distances_col[:n] == ""))
+        if missing.size:
+            row = missing[0]
+            raise ValueError(f"Missing bearing or distance for Line '{lines[row]}' at row {row + 1}.")
+
+        if n == 0:
             raise ValueError("No data found in the table. Please enter or import data.")
+
+        bearings = [b.strip() for b in bearings_col[:n]]
+        distances = np.fromiter((float(d) for d in distances_col[:n]), dtype=np.float64, count=n)
         return bearings, distances
 
     def get_start_coordinates(self):
@@ -408,44 +448,17 @@ class CompassTab(QWidget):
 
     def populate_results_in_table(self, latitudes, departures, lat_corrections, dep_corrections, final_coords):
         """Writes the calculated and adjusted values into the table's output columns."""
-        # Column indices have changed
-        lat_col, dep_col = 3, 4
-        lat_corr_col, dep_corr_col = 5, 6
-        east_col, north_col = 7, 8
-
-        for i in range(len(latitudes)):
-            # Unadjusted Lat/Dep
-            self.table.setItem(i, lat_col, QTableWidgetItem(f"{latitudes[i]:.4f}"))
-            self.table.setItem(i, dep_col, QTableWidgetItem(f"{departures[i]:.4f}"))
-
-            # Corrections
-            self.table.setItem(i, lat_corr_col, QTableWidgetItem(f"{lat_corrections[i]:.4f}"))
-            self.table.setItem(i, dep_corr_col, QTableWidgetItem(f"{dep_corrections[i]:.4f}"))
-
-            # Final Adjusted Coordinates (for the END of the line)
-            adj_easting = final_coords[i+1][0]
-            adj_northing = final_coords[i+1][1]
-            self.table.setItem(i, east_col, QTableWidgetItem(f"{adj_easting:.4f}")) # Easting is X
-            self.table.setItem(i, north_col, QTableWidgetItem(f"{adj_northing:.4f}")) # Northing is Y
-
-        # Resize columns to fit the new content
-        self.table.resizeColumnsToContents()
+        final_coords = np.asarray(final_coords)
+        # Final adjusted coordinates are for the END of each line: Easting is X, Northing is Y
+        self.model.set_results([
+            latitudes, departures,
+            lat_corrections, dep_corrections,
+            final_coords[1:, 0], final_coords[1:, 1],
+        ])
 
     def get_table_data_as_dataframe(self):
-        """Reads all data from the QTableWidget into a pandas DataFrame."""
-        col_headers = [self.table.horizontalHeaderItem(i).text() for i in range(self.table.columnCount())]
-        data = []
-        for row in range(self.table.rowCount()):
-            row_data = []
-            # Check if the first cell has data, if not, assume it's an empty row
-            first_item = self.table.item(row, 0)
-            if not (first_item and first_item.text()):
-                continue
-            for col in range(self.table.columnCount()):
-                item = self.table.item(row, col)
-                row_data.append(item.text() if item else "")
-            data.append(row_data)
-        return pd.DataFrame(data, columns=col_headers)
+        """Returns the table's filled rows as a pandas DataFrame."""
+        return self.model.to_dataframe()
 
     def handle_export_csv(self):
         """Handles exporting the current table data to a CSV file."""
@@ -478,6 +491,7 @@ class CompassTab(QWidget):
         if not file_path:
             return
 
+        from data_services.pdf_reporter import generate_traverse_report
         if generate_traverse_report("Compass Traverse Report", self.calculation_summary, df, file_path):
             QMessageBox.information(self, "Success", f"Report successfully saved to {file_path}")
         else:
@@ -485,7 +499,7 @@ class CompassTab(QWidget):
 
     def handle_export_kml(self):
         """Handles exporting adjusted coordinates to a KML file for Google Earth."""
-        if not self.final_coords:
+        if len(self.final_coords) == 0:
             QMessageBox.warning(self, "Export Error", "Please run a calculation to generate coordinates first.")
             return
 
@@ -497,17 +511,12 @@ class CompassTab(QWidget):
             return
 
         try:
-            # The coordinates are (Easting, Northing), which is (x, y)
-            local_points = [(coord[0], coord[1]) for coord in self.final_coords]
-            
-            # convert_to_global returns (lon, lat) which is what simplekml needs
-            global_points = convert_to_global(local_points, epsg_code)
+            # (lon, lat) is what simplekml needs
+            global_points = self.get_global_points(epsg_code)
 
             # Prepare points for KML exporter: (name, lon, lat)
-            kml_points = []
-            kml_points.append(("Start Point", global_points[0][0], global_points[0][1]))
-            for i, (lon, lat) in enumerate(global_points[1:], start=1):
-                kml_points.append((f"Point {i}", lon, lat))
+            names = ["Start Point"] + [f"Point {i}" for i in range(1, len(global_points))]
+            kml_points = [(name, lon, lat) for name, (lon, lat) in zip(names, global_points)]
 
         except Exception as e:
             QMessageBox.critical(self, "Conversion Error", f"Could not convert coordinates: {e}")
@@ -518,14 +527,25 @@ class CompassTab(QWidget):
             return
 
         try:
+            from data_services.kml_exporter import export_to_kml
             export_to_kml(file_path, kml_points)
             QMessageBox.information(self, "Success", f"KML file successfully saved to {file_path}")
         except Exception as e:
             QMessageBox.critical(self, "Export Error", f"Failed to generate KML file: {e}")
 
+    def get_global_points(self, epsg_code):
+        """Returns final_coords as WGS84 (lon, lat), converting once per EPSG code."""
+        global_points = self._global_points_cache.get(epsg_code)
+        if global_points is None:
+            from core.coordinate_converter import convert_to_global
+            # final_coords is an (N, 2) array of (Easting, Northing), which is (x, y)
+            global_points = convert_to_global(self.final_coords, epsg_code)
+            self._global_points_cache[epsg_code] = global_points
+        return global_points
+
     def handle_save_plot(self):
         """Saves the current traverse plot to a file."""
-        if not self.plot_group.isVisible() or not self.final_coords:
+        if self.plot_widget is None or not self.plot_group.isVisible() or len(self.final_coords) == 0:
             QMessageBox.warning(self, "Save Plot Error", "No plot is currently visible or calculated to save.")
             return
         file_path, _ = QFileDialog.getSaveFileName(self, "Save Plot", "", "Image Files (*.png *.jpg *.pdf);;All Files (*)")
@@ -540,8 +560,12 @@ class CompassTab(QWidget):
             
         try:
             epsg = int(self.epsg_input.text())
-            # coords is list of (E, N). convert_to_global returns list of (lon, lat)
-            global_pts = convert_to_global(coords, epsg)
+            # coords is an (N, 2) array of (E, N). convert_to_global returns list of (lon, lat)
+            if coords is self.final_coords:
+                global_pts = self.get_global_points(epsg)
+            else:
+                from core.coordinate_converter import convert_to_global
+                global_pts = convert_to_global(coords, epsg)
             
             if not global_pts: return
             
@@ -0,0 +1,29 @@
+# Background CSV loading for the data tabs
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+
+from data_services.csv_handler import import_csv_to_dataframe
+
+class CsvLoadSignals(QObject):
+    """Signals for CsvLoadWorker; a QRunnable cannot emit signals itself."""
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+class CsvLoadWorker(QRunnable):
+    """
+    Reads a CSV file into a DataFrame on a QThreadPool thread.
+
+    The signals object is created on the GUI thread, so its slots run there
+    through a queued connection once parsing is done.
+    """
+    def __init__(self, file_path, dtype=None):
+        super().__init__()
+        self.file_path = file_path
+        self.dtype = dtype
+        self.signals = CsvLoadSignals()
+
+    def run(self):
+        df = import_csv_to_dataframe(self.file_path, dtype=self.dtype)
+        if df is None:
+            self.signals.failed.emit("Failed to read or process the CSV file.")
+        else:
+            self.signals.finished.emit(df)
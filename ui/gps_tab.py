@@ -6,8 +6,9 @@ from PyQt6.QtWidgets import (
     QLabel, QHeaderView, QLineEdit, QMessageBox, QTableWidgetItem, QFileDialog,
     QScrollArea
 )
-from PyQt6.QtGui import QColor, QDesktopServices
+from PyQt6.QtGui import QDesktopServices
 from PyQt6.QtCore import Qt, QUrl
+import numpy as np
 import pandas as pd
 import tempfile
 import os
@@ -15,6 +16,8 @@ import os
 from data_services.csv_handler import import_csv_to_dataframe, export_dataframe_to_csv
 from data_services.kml_exporter import export_to_kml
 from core.coordinate_converter import convert_coords, get_utm_epsg_code
+from .table_updates import batched_table_update
+from .button_styles import create_styled_button
 
 class GpsTab(QWidget):
     def __init__(self):
@@ -81,9 +84,9 @@ class GpsTab(QWidget):
         controls_layout.addSpacing(20)
 
         # Action Buttons
-        self.import_csv_button = self.create_styled_button("Import from CSV", "#007BFF")
-        self.convert_button = self.create_styled_button("Convert Coordinates", "#28A745")
-        self.clear_button = self.create_styled_button("Clear All", "#FFC107", text_color="#000000")
+        self.import_csv_button = create_styled_button("Import from CSV", "#007BFF")
+        self.convert_button = create_styled_button("Convert Coordinates", "#28A745")
+        self.clear_button = create_styled_button("Clear All", "#FFC107", text_color="#000000")
         controls_layout.addWidget(self.import_csv_button)
         controls_layout.addWidget(self.convert_button)
         controls_layout.addWidget(self.clear_button)
@@ -93,13 +96,13 @@ class GpsTab(QWidget):
         export_label = QLabel("Export Results")
         export_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         controls_layout.addWidget(export_label)
-        self.export_csv_button = self.create_styled_button("Export to CSV", "#6C757D")
-        self.export_kml_button = self.create_styled_button("Export to KML", "#FFC107", text_color="#000000")
+        self.export_csv_button = create_styled_button("Export to CSV", "#6C757D")
+        self.export_kml_button = create_styled_button("Export to KML", "#FFC107", text_color="#000000")
         controls_layout.addWidget(self.export_csv_button)
         controls_layout.addWidget(self.export_kml_button)
         
         # New Button for Internet Link
-        self.view_online_button = self.create_styled_button("View All on Google Earth", "#4285F4")
+        self.view_online_button = create_styled_button("View All on Google Earth", "#4285F4")
         controls_layout.addWidget(self.view_online_button)
 
         controls_layout.addStretch()
@@ -136,30 +139,19 @@ class GpsTab(QWidget):
             from_epsg = int(self.from_crs_input.text())
             to_epsg = int(self.to_crs_input.text())
             
-            points_to_convert = []
-            rows_to_process = []
-            for row in range(self.table.rowCount()):
-                x_item = self.table.item(row, 1)
-                y_item = self.table.item(row, 2)
-                if x_item and x_item.text() and y_item and y_item.text():
-                    x = float(x_item.text())
-                    y = float(y_item.text())
-                    z_item = self.table.item(row, 3)
-                    z = float(z_item.text()) if z_item and z_item.text() else 0.0
-                    points_to_convert.append((x, y, z))
-                    rows_to_process.append(row)
-
-            if not points_to_convert:
+            rows_to_process, _, points_to_convert = self._collect_points()
+            if not rows_to_process:
                 QMessageBox.warning(self, "No Data", "No points were found to convert.")
                 return
 
             converted_points = convert_coords(points_to_convert, from_epsg, to_epsg)
+            formatted = np.char.mod("%.6f", converted_points).tolist()
 
-            for i, row_idx in enumerate(rows_to_process):
-                x_out, y_out, z_out = converted_points[i]
-                self.table.setItem(row_idx, 4, QTableWidgetItem(f"{x_out:.6f}"))
-                self.table.setItem(row_idx, 5, QTableWidgetItem(f"{y_out:.6f}"))
-                self.table.setItem(row_idx, 6, QTableWidgetItem(f"{z_out:.6f}"))
+            with batched_table_update(self.table):
+                for row_idx, (x_out, y_out, z_out) in zip(rows_to_process, formatted):
+                    self.table.setItem(row_idx, 4, QTableWidgetItem(x_out))
+                    self.table.setItem(row_idx, 5, QTableWidgetItem(y_out))
+                    self.table.setItem(row_idx, 6, QTableWidgetItem(z_out))
 
             QMessageBox.information(self, "Success", f"Successfully converted {len(converted_points)} points.")
 
@@ -168,6 +160,56 @@ class GpsTab(QWidget):
         except Exception as e:
             QMessageBox.critical(self, "Conversion Error", f"An error occurred during conversion: {e}")
 
+    def _collect_points(self, require_name=False, skip_invalid=False):
+        """
+        Reads the input points from the table in a single pass.
+
+        A row is used when it has X and Y (and a name, if require_name is set).
+        A missing Z is taken as 0 and a missing name becomes "Point <row>".
+        Values are parsed per column once all rows have been read.
+
+        Args:
+            require_name (bool): Skip rows without a point name.
+            skip_invalid (bool): Drop rows with a value that is not a number
+                instead of raising ValueError.
+
+        Returns:
+            tuple: (table row indices, point names, (N, 3) array of x, y, z)
+        """
+        rows, names, xs, ys, zs = [], [], [], [], []
+        item = self.table.item
+        for row in range(self.table.rowCount()):
+            x_item = item(row, 1)
+            y_item = item(row, 2)
+            if not (x_item and x_item.text() and y_item and y_item.text()):
+                continue
+            name_item = item(row, 0)
+            name = name_item.text() if name_item else ""
+            if not name:
+                if require_name:
+                    continue
+                name = f"Point {row + 1}"
+            z_item = item(row, 3)
+            rows.append(row)
+            names.append(name)
+            xs.append(x_item.text())
+            ys.append(y_item.text())
+            zs.append(z_item.text() if z_item and z_item.text() else "0")
+
+        points = np.empty((len(rows), 3))
+        for col, texts in enumerate((xs, ys, zs)):
+            points[:, col] = pd.to_numeric(texts, errors='coerce')
+
+        invalid = np.isnan(points).any(axis=1)
+        if invalid.any():
+            if not skip_invalid:
+                raise ValueError(f"Invalid coordinate value in row {rows[np.argmax(invalid)] + 1}.")
+            keep = np.flatnonzero(~invalid).tolist()
+            rows = [rows[i] for i in keep]
+            names = [names[i] for i in keep]
+            points = points[keep]
+        return rows, names, points
+
     def handle_swap_crs(self):
         """Swaps the From and To EPSG codes."""
         from_val = self.from_crs_input.text()
@@ -187,16 +229,22 @@ class GpsTab(QWidget):
                 QMessageBox.critical(self, "Error", str(e))
 
     def get_table_data_as_dataframe(self):
-        headers = [self.table.horizontalHeaderItem(i).text() for i in range(self.table.columnCount())]
+        ncols = self.table.columnCount()
+        headers = [self.table.horizontalHeaderItem(i).text() for i in range(ncols)]
+        item = self.table.item
         data = []
         for row in range(self.table.rowCount()):
-            first_item = self.table.item(row, 0)
-            if not (first_item and first_item.text()): continue
-            row_data = [self.table.item(row, col).text() if self.table.item(row, col) else "" for col in range(self.table.columnCount())]
-            data.append(row_data)
-        return pd.DataFrame(data, columns=headers)
+            # Fetch each cell's item once and reuse it for the test and the read
+            items = [item(row, col) for col in range(ncols)]
+            if not (items[0] and items[0].text()): continue
+            data.append([it.text() if it else "" for it in items])
+        return pd.DataFrame.from_records(data, columns=headers)
 
     def populate_table_from_dataframe(self, df):
+        with batched_table_update(self.table):
+            self._fill_table(df)
+
+    def _fill_table(self, df):
         self.table.clearContents()
         self.table.setRowCount(len(df))
         
@@ -212,18 +260,24 @@ class GpsTab(QWidget):
         # Normalize DF columns for easier matching
         df.columns = [str(c).strip() for c in df.columns]
 
-        for row_idx, row_data in df.iterrows():
-            for table_col_idx, aliases in col_map.items():
-                val = ""
-                for alias in aliases:
-                    # Case-insensitive match
-                    match = next((col for col in df.columns if col.lower() == alias.lower()), None)
-                    if match:
-                        raw_val = row_data[match]
-                        if pd.notna(raw_val):
-                            val = str(raw_val)
-                        break
-                
+        # Resolve each table column to the first matching alias (case-insensitive) up front;
+        # setdefault keeps the first DataFrame column when two differ only by case
+        lower_to_pos = {}
+        for pos, col in enumerate(df.columns):
+            lower_to_pos.setdefault(col.lower(), pos)
+        sources = {}
+        for table_col_idx, aliases in col_map.items():
+            for alias in aliases:
+                if alias.lower() in lower_to_pos:
+                    sources[table_col_idx] = lower_to_pos[alias.lower()]
+                    break
+
+        # Fill one column at a time, visiting only the rows that have a value
+        for table_col_idx, source in sources.items():
+            column = df.iloc[:, source]
+            values = column.to_numpy()
+            for row_idx in np.flatnonzero(column.notna().to_numpy()).tolist():
+                val = str(values[row_idx])
                 if val:
                     self.table.setItem(row_idx, table_col_idx, QTableWidgetItem(val))
 
@@ -252,27 +306,12 @@ class GpsTab(QWidget):
     def handle_export_kml(self):
         try:
             from_epsg = int(self.from_crs_input.text())
-            points_to_convert = []
-            for row in range(self.table.rowCount()):
-                name_item = self.table.item(row, 0)
-                x_item = self.table.item(row, 1)
-                y_item = self.table.item(row, 2)
-                if all(item and item.text() for item in [name_item, x_item, y_item]):
-                    z_item = self.table.item(row, 3)
-                    z = float(z_item.text()) if z_item and z_item.text() else None
-                    points_to_convert.append((name_item.text(), float(x_item.text()), float(y_item.text()), z))
-            
-            if not points_to_convert:
+            _, names, points = self._collect_points(require_name=True)
+            if not names:
                 QMessageBox.warning(self, "Export Error", "No valid points found to export.")
                 return
 
-            # Ensure points are in WGS84 (EPSG:4326) for KML
-            if from_epsg != 4326:
-                coords_only = [(p[1], p[2], p[3] if p[3] is not None else 0) for p in points_to_convert]
-                wgs84_coords = convert_coords(coords_only, from_epsg, 4326)
-                kml_points = [(points_to_convert[i][0], lon, lat, elev if elev is not None else 0) for i, (lon, lat, elev) in enumerate(wgs84_coords)]
-            else:
-                kml_points = [(p[0], p[1], p[2], p[3]) for p in points_to_convert]
+            kml_points = self._build_kml_points(names, points, from_epsg)
 
             file_path, _ = QFileDialog.getSaveFileName(self, "Export to KML", "", "KML Files (*.kml)")
             if not file_path: return
@@ -282,42 +321,22 @@ class GpsTab(QWidget):
         except Exception as e:
             QMessageBox.critical(self, "Export Error", f"Failed to generate KML file: {e}")
 
+    def _build_kml_points(self, names, points, from_epsg):
+        """Returns (name, lon, lat, elev) tuples, reprojecting to WGS84 only when needed."""
+        if from_epsg != 4326:
+            points = convert_coords(points, from_epsg, 4326)
+        return list(zip(names, *points.T.tolist()))
+
     def handle_view_online(self):
         """Generates a temporary KML of all points and opens it."""
         try:
             from_epsg = int(self.from_crs_input.text())
-            points_to_convert = []
-            
-            # Gather all points
-            for row in range(self.table.rowCount()):
-                name_item = self.table.item(row, 0)
-                x_item = self.table.item(row, 1)
-                y_item = self.table.item(row, 2)
-                
-                if x_item and x_item.text() and y_item and y_item.text():
-                    name = name_item.text() if name_item and name_item.text() else f"Point {row+1}"
-                    try:
-                        x = float(x_item.text())
-                        y = float(y_item.text())
-                        z_item = self.table.item(row, 3)
-                        z = float(z_item.text()) if z_item and z_item.text() else 0.0
-                        points_to_convert.append((name, x, y, z))
-                    except ValueError:
-                        continue
-
-            if not points_to_convert:
+            _, names, points = self._collect_points(skip_invalid=True)
+            if not names:
                 QMessageBox.warning(self, "No Data", "No valid points found to view.")
                 return
-            
-            # Convert to WGS84
-            coords_only = [(p[1], p[2], p[3]) for p in points_to_convert]
-            wgs84_coords = convert_coords(coords_only, from_epsg, 4326)
-            
-            # Prepare KML data
-            kml_points = []
-            for i, (lon, lat, elev) in enumerate(wgs84_coords):
-                name = points_to_convert[i][0]
-                kml_points.append((name, lon, lat, elev))
+
+            kml_points = self._build_kml_points(names, points, from_epsg)
 
             # Create temporary file
             fd, temp_path = tempfile.mkstemp(suffix='.kml', prefix='survey_view_')
@@ -331,22 +350,11 @@ class GpsTab(QWidget):
             QMessageBox.critical(self, "Error", f"Could not open map: {e}")
 
     def handle_clear(self):
-        self.table.clearContents()
-        self.table.setRowCount(10)
+        with batched_table_update(self.table):
+            self.table.clearContents()
+            self.table.setRowCount(10)
 
     def remove_row(self):
         current_row = self.table.currentRow()
         if current_row >= 0: self.table.removeRow(current_row)
         else: QMessageBox.information(self, "Information", "Please select a row to remove.")
-
-    def create_styled_button(self, text, bg_color, text_color="#FFFFFF"):
-        button = QPushButton(text)
-        button.setStyleSheet(f"""
-            QPushButton {{ background-color: {bg_color}; color: {text_color}; border-radius: 5px;
-                          padding: 10px; font-size: 14px; font-weight: bold; }}
-            QPushButton:hover {{ background-color: {self.darken_color(bg_color)}; }}""")
-        return button
-
-    def darken_color(self, color_str, factor=0.85):
-        color = QColor(color_str)
-        return color.darker(int(100 / factor)).name()
\ No newline at end of file
@@ -15,10 +15,13 @@ from PyQt6.QtWidgets import (
     QMessageBox,
     QScrollArea
 )
-from PyQt6.QtGui import QColor
 from PyQt6.QtCore import Qt
+import numpy as np
 import pandas as pd
 
+from core.leveling import calculate_levels
+from .table_updates import batched_table_update
+from .button_styles import create_styled_button
 # Import data service functions
 from data_services.csv_handler import import_csv_to_dataframe, export_dataframe_to_csv
 from data_services.pdf_reporter import generate_leveling_report
@@ -82,9 +85,9 @@ class LevelingTab(QWidget):
         controls_group.setFixedWidth(250)
         controls_layout = QVBoxLayout(controls_group)
 
-        self.import_csv_button = self.create_styled_button("Import from CSV", "#007BFF")
-        self.calculate_button = self.create_styled_button("Calculate Levels", "#28A745")
-        self.clear_button = self.create_styled_button("Clear All Data", "#FFC107", text_color="#000000")
+        self.import_csv_button = create_styled_button("Import from CSV", "#007BFF")
+        self.calculate_button = create_styled_button("Calculate Levels", "#28A745")
+        self.clear_button = create_styled_button("Clear All Data", "#FFC107", text_color="#000000")
         
         controls_layout.addWidget(self.import_csv_button)
         controls_layout.addWidget(self.calculate_button)
@@ -96,8 +99,8 @@ class LevelingTab(QWidget):
         export_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         controls_layout.addWidget(export_label)
         
-        self.export_csv_button = self.create_styled_button("Export to CSV", "#6C757D")
-        self.export_pdf_button = self.create_styled_button("Export Report (PDF)", "#DC3545")
+        self.export_csv_button = create_styled_button("Export to CSV", "#6C757D")
+        self.export_pdf_button = create_styled_button("Export Report (PDF)", "#DC3545")
 
         controls_layout.addWidget(self.export_csv_button)
         controls_layout.addWidget(self.export_pdf_button)
@@ -130,30 +133,6 @@ class LevelingTab(QWidget):
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         self.table.setRowCount(10) # Start with 10 rows
 
-    def create_styled_button(self, text, bg_color, text_color="#FFFFFF"):
-        """Factory function to create a styled QPushButton."""
-        button = QPushButton(text)
-        button.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {bg_color};
-                color: {text_color};
-                border-radius: 5px;
-                padding: 10px;
-                font-size: 14px;
-                font-weight: bold;
-            }}
-            QPushButton:hover {{
-                background-color: {self.darken_color(bg_color)};
-            }}
-        """)
-        return button
-
-    def darken_color(self, color_str, factor=0.85):
-        """Darkens a hex color string."""
-        color = QColor(color_str)
-        # QColor.darker() takes an integer percentage (100-400). 100/0.85 is ~117.
-        return color.darker(int(100 / factor)).name()
-
     def add_row(self):
         self.table.insertRow(self.table.rowCount())
 
@@ -195,11 +174,12 @@ class LevelingTab(QWidget):
         self.table.setRowCount(len(df))
         headers = [self.table.horizontalHeaderItem(i).text() for i in range(self.table.columnCount())]
 
-        for row_idx, row_data in df.iterrows():
-            for col_idx, col_name in enumerate(headers):
-                if col_name in df.columns:
-                    item_data = str(row_data.get(col_name, ""))
-                    self.table.setItem(row_idx, col_idx, QTableWidgetItem(item_data))
+        # Table columns that exist in the CSV, read row by row as plain tuples
+        targets = [(col_idx, col_name) for col_idx, col_name in enumerate(headers) if col_name in df.columns]
+        rows = df[[col_name for _, col_name in targets]].itertuples(index=False, name=None)
+        for row_idx, row_data in enumerate(rows):
+            for (col_idx, _), value in zip(targets, row_data):
+                self.table.setItem(row_idx, col_idx, QTableWidgetItem(str(value)))
 
     def handle_import_csv(self):
         """Imports leveling data from a CSV file."""
@@ -249,61 +229,40 @@ class LevelingTab(QWidget):
         """Performs the differential leveling calculation."""
         try:
             start_elevation = self.start_bm_elevation.value()
-            
-            # Set starting elevation in the first row
-            self.table.setItem(0, 4, QTableWidgetItem(f"{start_elevation:.4f}"))
-
-            total_bs = 0.0
-            total_fs = 0.0
 
+            # Read BS/FS for every booked row, stopping at the first empty one
+            backsights, foresights = [], []
             for row in range(self.table.rowCount()):
-                # Read BS
-                bs_item = self.table.item(row, 1)
-                bs = float(bs_item.text()) if bs_item and bs_item.text() else 0.0
-
-                # Read Elevation of current row
-                elev_item = self.table.item(row, 4)
-                if not (elev_item and elev_item.text()):
-                    # If we don't have an elevation and no BS to create one, stop
-                    if bs == 0.0: break 
-                    else: raise ValueError(f"Missing elevation at row {row+1} before a turning point.")
-                
-                elevation = float(elev_item.text())
-
-                # Calculate HI if there is a backsight
-                if bs > 0:
-                    hi = elevation + bs
-                    total_bs += bs
-                    self.table.setItem(row, 2, QTableWidgetItem(f"{hi:.4f}"))
-                else:
-                    # If no BS, HI carries over from the previous setup
-                    hi_item = self.table.item(row - 1, 2)
-                    if not (hi_item and hi_item.text()):
-                        # This case happens on the first row if no BS is entered
-                        if row == 0: continue
-                        raise ValueError(f"Cannot calculate Foresight at row {row+1} without a Height of Instrument.")
-                    hi = float(hi_item.text())
-
-                # Read FS and calculate next elevation
-                fs_item = self.table.item(row, 3)
-                if fs_item and fs_item.text():
-                    fs = float(fs_item.text())
-                    total_fs += fs
-                    next_elevation = hi - fs
-                    
-                    # Put the new elevation in the *next* row
-                    if row + 1 < self.table.rowCount():
-                        self.table.setItem(row + 1, 4, QTableWidgetItem(f"{next_elevation:.4f}"))
-                    else:
-                        # This is the last row, so we can't place the next elevation
-                        pass
-            
+                texts = [self.table.item(row, col).text() if self.table.item(row, col) else "" for col in (0, 1, 3)]
+                if not any(texts):
+                    break
+                backsights.append(float(texts[1]) if texts[1] else 0.0)
+                foresights.append(float(texts[2]) if texts[2] else 0.0)
+
+            if not backsights:
+                raise ValueError("No data found in the table. Please enter or import data.")
+            if backsights[0] == 0.0:
+                raise ValueError("The first row needs a Backsight (BS) to establish the Height of Instrument.")
+
+            # Reduce the whole run at once; each FS gives the elevation of the next row
+            hi, elevations = calculate_levels(start_elevation, backsights, foresights)
+            n_rows = len(backsights)
+
+            with batched_table_update(self.table):
+                for row in range(n_rows):
+                    if backsights[row] > 0:
+                        self.table.setItem(row, 2, QTableWidgetItem(f"{hi[row]:.4f}"))
+                    self.table.setItem(row, 4, QTableWidgetItem(f"{elevations[row]:.4f}"))
+
+            # The last FS closes onto the next row if there is one to hold it
+            closes_on_next = foresights[-1] > 0
+            if closes_on_next and n_rows < self.table.rowCount():
+                self.table.setItem(n_rows, 4, QTableWidgetItem(f"{elevations[n_rows]:.4f}"))
+
             # Arithmetic Check
-            last_elev_item = self.table.item(self.find_last_data_row(), 4)
-            if not last_elev_item:
-                raise ValueError("Calculation incomplete. Could not find final elevation.")
-            
-            end_elevation = float(last_elev_item.text())
+            total_bs = float(np.sum(backsights))
+            total_fs = float(np.sum(foresights))
+            end_elevation = float(elevations[n_rows] if closes_on_next else elevations[n_rows - 1])
             misclosure = (start_elevation + total_bs - total_fs) - end_elevation
 
             # Store results for display and reporting
@@ -323,12 +282,3 @@ class LevelingTab(QWidget):
             QMessageBox.critical(self, "Input Error", f"Please check your data. A number might be missing or invalid.\n\nDetails: {e}")
         except Exception as e:
             QMessageBox.critical(self, "Error", f"An unexpected error occurred: {e}")
-
-    def find_last_data_row(self):
-        """Finds the last row containing any data."""
-        for r in range(self.table.rowCount() - 1, -1, -1):
-            for c in range(self.table.columnCount()):
-                item = self.table.item(r, c)
-                if item and item.text():
-                    return r
-        return 0
@@ -27,12 +27,12 @@ class PlotWidget(QWidget):
         Plots the traverse points and the lines connecting them.
 
         Args:
-            points (list of tuples): A list of (easting, northing) coordinates.
+            points (list of tuples or np.ndarray): (easting, northing) coordinates.
             title (str): The title for the plot.
         """
         self.axes.clear()
 
-        if not points or len(points) < 2:
+        if len(points) < 2:
             self.axes.set_title("Not enough data to plot")
             self.canvas.draw()
             return
@@ -0,0 +1,36 @@
+# Read-only table model for calculated results
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+class ResultsTableModel(QAbstractTableModel):
+    """
+    Holds a block of already-formatted result rows for a QTableView.
+
+    Replacing the data resets the model once, instead of creating and inserting
+    a QTableWidgetItem for every cell.
+    """
+    def __init__(self, headers, parent=None):
+        super().__init__(parent)
+        self._headers = list(headers)
+        self._rows = []
+
+    def update(self, rows):
+        """Replaces all rows; each row is a sequence of display strings."""
+        self.beginResetModel()
+        self._rows = [list(row) for row in rows]
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._headers)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and index.isValid():
+            return self._rows[index.row()][index.column()]
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self._headers[section]
+        return super().headerData(section, orientation, role)
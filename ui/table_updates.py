@@ -0,0 +1,22 @@
+# Helpers for writing many cells into a QTableWidget at once
+from contextlib import contextmanager
+
+@contextmanager
+def batched_table_update(table):
+    """
+    Suspends repaints and item signals while a table is filled in bulk.
+
+    Without this every setItem emits itemChanged and schedules its own repaint;
+    here the table repaints once when the block exits. Sorting is switched off
+    meanwhile so rows cannot move under the writes.
+    """
+    sorting = table.isSortingEnabled()
+    table.setSortingEnabled(False)
+    table.setUpdatesEnabled(False)
+    table.blockSignals(True)
+    try:
+        yield table
+    finally:
+        table.blockSignals(False)
+        table.setUpdatesEnabled(True)
+        table.setSortingEnabled(sorting)
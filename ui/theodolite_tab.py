@@ -19,7 +19,6 @@ from PyQt6.QtWidgets import (
     QScrollArea
 )
 from PyQt6.QtWidgets import QTableWidgetItem, QTabWidget
-from PyQt6.QtGui import QColor
 from PyQt6.QtCore import Qt
 import numpy as np
 import pandas as pd
@@ -27,7 +26,9 @@ import math
 import io
 
 from .plot_widget import PlotWidget
-from core.calculations import dms_to_dd, dd_to_dms, calculate_lat_dep, calculate_coordinates
+from .table_updates import batched_table_update
+from .button_styles import create_styled_button
+from core.calculations import dms_to_dd, dms_to_dd_array, dd_to_dms, calculate_lat_dep, calculate_coordinates
 from core.adjustments import adjust_traverse_bowditch
 from data_services.csv_handler import import_csv_to_dataframe, export_dataframe_to_csv
 from data_services.pdf_reporter import generate_theodolite_report
@@ -187,10 +188,10 @@ class TheodoliteTab(QWidget):
         controls_layout.addSpacing(10)
 
         # Action Buttons
-        self.import_csv_button = self.create_styled_button("Import from CSV", "#007BFF")
-        self.calculate_button = self.create_styled_button("Calculate Traverse", "#28A745")
-        self.save_plot_button = self.create_styled_button("Save Plot", "#17A2B8")
-        self.clear_button = self.create_styled_button("Clear All", "#FFC107", text_color="#000000")
+        self.import_csv_button = create_styled_button("Import from CSV", "#007BFF")
+        self.calculate_button = create_styled_button("Calculate Traverse", "#28A745")
+        self.save_plot_button = create_styled_button("Save Plot", "#17A2B8")
+        self.clear_button = create_styled_button("Clear All", "#FFC107", text_color="#000000")
         
         controls_layout.addWidget(self.import_csv_button)
         controls_layout.addWidget(self.calculate_button)
@@ -202,9 +203,9 @@ class TheodoliteTab(QWidget):
         export_label = QLabel("Export Results")
         export_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         controls_layout.addWidget(export_label)
-        self.export_csv_button = self.create_styled_button("Export to CSV", "#6C757D")
-        self.export_pdf_button = self.create_styled_button("Export Report (PDF)", "#DC3545")
-        self.export_kml_button = self.create_styled_button("Export to KML", "#FFC107", text_color="#000000")
+        self.export_csv_button = create_styled_button("Export to CSV", "#6C757D")
+        self.export_pdf_button = create_styled_button("Export Report (PDF)", "#DC3545")
+        self.export_kml_button = create_styled_button("Export to KML", "#FFC107", text_color="#000000")
 
         controls_layout.addWidget(self.export_csv_button)
         controls_layout.addWidget(self.export_pdf_button)
@@ -281,17 +282,20 @@ class TheodoliteTab(QWidget):
 
             lines.append(line_item.text().strip())
             
-            angle_str = angle_item.text().strip()
-            if angle_format == "DD.MMSS":
-                angles.append(dms_to_dd(angle_str))
-            else: # Decimal Degrees
-                angles.append(float(angle_str))
-
+            angles.append(angle_item.text().strip())
             distances.append(float(dist_item.text().strip()))
 
         if not lines:
             raise ValueError("No data found in the table. Please enter or import data.")
-        return lines, np.array(angles), np.array(distances)
+
+        # Convert the whole angle column in one go
+        if angle_format == "DD.MMSS":
+            angles = dms_to_dd_array(angles)
+            if np.isnan(angles).any():
+                raise ValueError("Invalid DD.MMSS angle found in the table.")
+        else: # Decimal Degrees
+            angles = np.array(angles, dtype=float)
+        return lines, angles, np.array(distances)
 
     def handle_calculate(self):
         """Performs the full theodolite traverse calculation and adjustment."""
@@ -339,8 +343,8 @@ class TheodoliteTab(QWidget):
             # 4. Calculate Latitudes, Departures, and Linear Misclosure
             latitudes, departures = calculate_lat_dep(np.array(azimuths), distances)
             
-            lat_misclosure = np.sum(latitudes)
-            dep_misclosure = np.sum(departures)
+            lat_misclosure = latitudes.sum()
+            dep_misclosure = departures.sum()
             
             # 5. Adjust Traverse (Bowditch)
             adj_latitudes, adj_departures, _, _ = adjust_traverse_bowditch(distances, latitudes, departures)
@@ -355,7 +359,7 @@ class TheodoliteTab(QWidget):
             results_text = f"Angular Misclosure: {dd_to_dms(angular_misclosure)}\n"
             results_text += f"Latitude Misclosure: {lat_misclosure:.4f} m\n"
             results_text += f"Departure Misclosure: {dep_misclosure:.4f} m\n"
-            linear_misclosure = math.sqrt(lat_misclosure**2 + dep_misclosure**2)
+            linear_misclosure = np.hypot(lat_misclosure, dep_misclosure)
             results_text += f"Linear Misclosure: {linear_misclosure:.4f} m\n"
             precision = np.sum(distances) / linear_misclosure if linear_misclosure != 0 else float('inf')
             results_text += f"Precision: 1 in {precision:,.0f}"
@@ -388,12 +392,13 @@ class TheodoliteTab(QWidget):
 
     def populate_results_in_table(self, azimuths, lats, deps, coords):
         """Writes the calculated values into the table's output columns."""
-        for i in range(len(azimuths)):
-            self.table.setItem(i, 6, QTableWidgetItem(dd_to_dms(azimuths[i])))
-            self.table.setItem(i, 7, QTableWidgetItem(f"{lats[i]:.4f}"))
-            self.table.setItem(i, 8, QTableWidgetItem(f"{deps[i]:.4f}"))
-            self.table.setItem(i, 9, QTableWidgetItem(f"{coords[i+1][0]:.4f}")) # Easting
-            self.table.setItem(i, 10, QTableWidgetItem(f"{coords[i+1][1]:.4f}")) # Northing
+        with batched_table_update(self.table):
+            for i in range(len(azimuths)):
+                self.table.setItem(i, 6, QTableWidgetItem(dd_to_dms(azimuths[i])))
+                self.table.setItem(i, 7, QTableWidgetItem(f"{lats[i]:.4f}"))
+                self.table.setItem(i, 8, QTableWidgetItem(f"{deps[i]:.4f}"))
+                self.table.setItem(i, 9, QTableWidgetItem(f"{coords[i+1][0]:.4f}")) # Easting
+                self.table.setItem(i, 10, QTableWidgetItem(f"{coords[i+1][1]:.4f}")) # Northing
 
     def handle_table_item_changed(self, item):
         """
@@ -452,11 +457,12 @@ class TheodoliteTab(QWidget):
         self.table.clearContents()
         self.table.setRowCount(len(df))
         headers = [self.table.horizontalHeaderItem(i).text() for i in range(self.table.columnCount())]
-        for row_idx, row_data in df.iterrows():
-            for col_idx, col_name in enumerate(headers):
-                if col_name in df.columns:
-                    item_data = str(row_data.get(col_name, ""))
-                    self.table.setItem(row_idx, col_idx, QTableWidgetItem(item_data))
+        # Table columns that exist in the CSV, read row by row as plain tuples
+        targets = [(col_idx, col_name) for col_idx, col_name in enumerate(headers) if col_name in df.columns]
+        rows = df[[col_name for _, col_name in targets]].itertuples(index=False, name=None)
+        for row_idx, row_data in enumerate(rows):
+            for (col_idx, _), value in zip(targets, row_data):
+                self.table.setItem(row_idx, col_idx, QTableWidgetItem(str(value)))
 
     def handle_import_csv(self):
         file_path, _ = QFileDialog.getOpenFileName(self, "Import CSV", "", "CSV Files (*.csv)")
@@ -493,7 +499,7 @@ class TheodoliteTab(QWidget):
             QMessageBox.critical(self, "Export Error", "Failed to generate PDF report.")
 
     def handle_export_kml(self):
-        if not self.final_coords:
+        if len(self.final_coords) == 0:
             QMessageBox.warning(self, "Export Error", "Please run a calculation to generate coordinates first.")
             return
 
@@ -504,10 +510,10 @@ class TheodoliteTab(QWidget):
             return
 
         try:
-            if not self.final_coords:
+            if len(self.final_coords) == 0:
                 raise ValueError("No final coordinates available for conversion.")
-            # The coordinates are (Easting, Northing), which is (x, y)
-            local_points = [(coord[0], coord[1]) for coord in self.final_coords]
+            # The coordinates are an (N, 2) array of (Easting, Northing), which is (x, y)
+            local_points = self.final_coords
             
             # convert_to_global returns (lon, lat)
             global_points = convert_to_global(local_points, epsg_code)
@@ -540,7 +546,7 @@ class TheodoliteTab(QWidget):
             
         try:
             epsg = int(self.epsg_input.text())
-            # coords is list of (E, N). convert_to_global returns list of (lon, lat)
+            # coords is an (N, 2) array of (E, N). convert_to_global returns list of (lon, lat)
             global_pts = convert_to_global(coords, epsg)
             
             if not global_pts: return
@@ -581,7 +587,7 @@ class TheodoliteTab(QWidget):
 
     def handle_save_plot(self):
         """Saves the current traverse plot to a file."""
-        if not self.viz_group.isVisible() or not self.final_coords:
+        if not self.viz_group.isVisible() or len(self.final_coords) == 0:
             QMessageBox.warning(self, "Save Plot Error", "No plot is currently visible or calculated to save.")
             return
         file_path, _ = QFileDialog.getSaveFileName(self, "Save Plot", "", "Image Files (*.png *.jpg *.pdf);;All Files (*)")
@@ -589,29 +595,6 @@ class TheodoliteTab(QWidget):
             self.plot_widget.figure.savefig(file_path, dpi=300, bbox_inches='tight')
             QMessageBox.information(self, "Success", f"Plot saved to {file_path}")
 
-    def create_styled_button(self, text, bg_color, text_color="#FFFFFF"):
-        """Factory function to create a styled QPushButton."""
-        button = QPushButton(text)
-        button.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {bg_color};
-                color: {text_color};
-                border-radius: 5px;
-                padding: 10px;
-                font-size: 14px;
-                font-weight: bold;
-            }}
-            QPushButton:hover {{
-                background-color: {self.darken_color(bg_color)};
-            }}
-        """)
-        return button
-
-    def darken_color(self, color_str, factor=0.85):
-        """Darkens a hex color string."""
-        color = QColor(color_str)
-        return color.darker(int(100 / factor)).name()
-
     def add_row(self):
         """Adds a new empty row to the end of the table."""
         self.table.insertRow(self.table.rowCount())
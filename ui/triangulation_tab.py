@@ -8,6 +8,7 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtGui import QTextDocument
 from PyQt6.QtPrintSupport import QPrinter
 from PyQt6.QtCore import Qt
+import numpy as np
 import pandas as pd
 import math
 from .plot_widget import PlotWidget
@@ -789,12 +790,12 @@ class TriangulationTab(QWidget):
             
         self.table.setRowCount(0)
         # Expected columns: Base Start, Base End, New Point, Angle @ Start, Angle @ End, Angle @ New, Direction
-        for _, row in df.iterrows():
+        for row in df.itertuples(index=False, name=None):
             r = self.table.rowCount()
             self.table.insertRow(r)
             cols = ["Base Start", "Base End", "New Point", "Angle @ Start", "Angle @ End", "Angle @ New", "Direction"]
             for i, col in enumerate(cols):
-                val = str(row.iloc[i]) if i < len(row) else ""
+                val = str(row[i]) if i < len(row) else ""
                 if i == 6: # Direction Combo
                     combo = QComboBox()
                     combo.addItems(["Left (Anti-Clockwise)", "Right (Clockwise)"])
@@ -810,11 +811,8 @@ class TriangulationTab(QWidget):
             QMessageBox.warning(self, "Export Error", "No results to export.")
             return
             
-        data = []
-        for name, (e, n) in self.stations.items():
-            data.append({"Station": name, "Easting": e, "Northing": n})
-        
-        df = pd.DataFrame(data)
+        coords = np.array(list(self.stations.values()), dtype=float).reshape(-1, 2)
+        df = pd.DataFrame({"Station": list(self.stations), "Easting": coords[:, 0], "Northing": coords[:, 1]})
         file_path, _ = QFileDialog.getSaveFileName(self, "Export Results", "", "CSV Files (*.csv)")
         if file_path:
             export_dataframe_to_csv(df, file_path)
@@ -888,10 +886,14 @@ class TriangulationTab(QWidget):
         if not self.quad_stations:
             QMessageBox.warning(self, "Export Error", "No results to export.")
             return
-        data = [{"Station": n, "Easting": d['e'], "Northing": d['n']} for n, d in self.quad_stations.items()]
+        df = pd.DataFrame({
+            "Station": list(self.quad_stations),
+            "Easting": np.fromiter((d['e'] for d in self.quad_stations.values()), dtype=float, count=len(self.quad_stations)),
+            "Northing": np.fromiter((d['n'] for d in self.quad_stations.values()), dtype=float, count=len(self.quad_stations)),
+        })
         file_path, _ = QFileDialog.getSaveFileName(self, "Export Quad Results", "", "CSV Files (*.csv)")
         if file_path:
-            export_dataframe_to_csv(pd.DataFrame(data), file_path)
+            export_dataframe_to_csv(df, file_path)
             QMessageBox.information(self, "Success", f"Saved to {file_path}")
 
     def handle_save_quad_plot(self):
@@ -4,25 +4,28 @@ UI for the Trigonometric Leveling tab.
 from PyQt6.QtWidgets import (
     QWidget, QHBoxLayout, QVBoxLayout, QGroupBox, QTableWidget, QPushButton,
     QLabel, QHeaderView, QLineEdit, QMessageBox, QComboBox, QDoubleSpinBox,
-    QTableWidgetItem, QFileDialog, QInputDialog, QScrollArea
+    QTableWidgetItem, QFileDialog, QInputDialog, QScrollArea, QTableView
 )
-from PyQt6.QtGui import QColor
 from PyQt6.QtCore import Qt
 import numpy as np
 import pandas as pd
-import math
 
 from .plot_widget import PlotWidget
-from core.calculations import dms_to_dd, dd_to_dms, calculate_lat_dep, calculate_coordinates
+from core.calculations import dms_to_dd_array, calculate_lat_dep
 from data_services.csv_handler import import_csv_to_dataframe, export_dataframe_to_csv
 from data_services.pdf_reporter import generate_trig_leveling_report
+from .results_model import ResultsTableModel
+from .button_styles import create_styled_button
 from data_services.kml_exporter import export_to_kml
 from core.coordinate_converter import convert_to_global
 
+RESULT_HEADERS = ["Δ Elevation (m)", "Target Northing", "Target Easting", "Target Elevation"]
+
 class TrigLevelingTab(QWidget):
     def __init__(self):
         super().__init__()
         self.calculation_summary = {}
+        self.result_columns = [] # Formatted result columns, one list per RESULT_HEADERS entry
         self.final_points_3d = [] # Store as (Easting, Northing, Elevation)
         self.setup_ui()
 
@@ -80,6 +83,16 @@ class TrigLevelingTab(QWidget):
         data_layout.addLayout(row_mgmt_layout)
         left_layout.addWidget(data_group)
 
+        # Results Group: read-only view over the formatted result columns
+        results_group = QGroupBox("Results")
+        results_layout = QVBoxLayout(results_group)
+        self.results_model = ResultsTableModel(["Target Name"] + RESULT_HEADERS)
+        self.results_table = QTableView()
+        self.results_table.setModel(self.results_model)
+        self.results_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        results_layout.addWidget(self.results_table)
+        left_layout.addWidget(results_group)
+
         # --- Right Side: Controls & Results ---
         right_layout = QVBoxLayout()
         controls_group = QGroupBox("Controls & Results")
@@ -95,9 +108,9 @@ class TrigLevelingTab(QWidget):
         controls_layout.addSpacing(20)
 
         # Action Buttons
-        self.import_csv_button = self.create_styled_button("Import from CSV", "#007BFF")
-        self.calculate_button = self.create_styled_button("Calculate Elevations", "#28A745")
-        self.clear_button = self.create_styled_button("Clear All", "#FFC107", text_color="#000000")
+        self.import_csv_button = create_styled_button("Import from CSV", "#007BFF")
+        self.calculate_button = create_styled_button("Calculate Elevations", "#28A745")
+        self.clear_button = create_styled_button("Clear All", "#FFC107", text_color="#000000")
         controls_layout.addWidget(self.import_csv_button)
         controls_layout.addWidget(self.calculate_button)
         controls_layout.addWidget(self.clear_button)
@@ -107,9 +120,9 @@ class TrigLevelingTab(QWidget):
         export_label = QLabel("Export Results")
         export_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         controls_layout.addWidget(export_label)
-        self.export_csv_button = self.create_styled_button("Export to CSV", "#6C757D")
-        self.export_pdf_button = self.create_styled_button("Export Report (PDF)", "#DC3545")
-        self.export_kml_button = self.create_styled_button("Export to KML", "#FFC107", text_color="#000000")
+        self.export_csv_button = create_styled_button("Export to CSV", "#6C757D")
+        self.export_pdf_button = create_styled_button("Export Report (PDF)", "#DC3545")
+        self.export_kml_button = create_styled_button("Export to KML", "#FFC107", text_color="#000000")
         controls_layout.addWidget(self.export_csv_button)
         controls_layout.addWidget(self.export_pdf_button)
         controls_layout.addWidget(self.export_kml_button)
@@ -136,11 +149,10 @@ class TrigLevelingTab(QWidget):
 
     def setup_table(self):
         """Configures the properties of the data input table."""
-        self.table.setColumnCount(9)
+        self.table.setColumnCount(5)
         self.table.setHorizontalHeaderLabels([
             "Target Name", "Horiz. Distance (m)", "Vert. Angle",
-            "Target Height (m)", "Azimuth",
-            "Δ Elevation (m)", "Target Northing", "Target Easting", "Target Elevation"
+            "Target Height (m)", "Azimuth"
         ])
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         self.table.setRowCount(10)
@@ -162,45 +174,36 @@ class TrigLevelingTab(QWidget):
             angle_format = self.angle_format_combo.currentText()
             self.final_points_3d = [] # Clear previous results
 
-            for row in range(self.table.rowCount()):
-                # Read inputs from the table row
-                dist_item = self.table.item(row, 1)
-                angle_item = self.table.item(row, 2)
-                target_h_item = self.table.item(row, 3)
-                azimuth_item = self.table.item(row, 4)
-
-                if not all(item and item.text() for item in [dist_item, angle_item, target_h_item, azimuth_item]):
-                    break # Stop at first empty row
-
-                horiz_dist = float(dist_item.text())
-                target_height = float(target_h_item.text())
-                
-                vert_angle_str = angle_item.text()
-                azimuth_str = azimuth_item.text()
-                if angle_format == "DD.MMSS":
-                    vert_angle_dd = dms_to_dd(vert_angle_str)
-                    azimuth_dd = dms_to_dd(azimuth_str)
-                else: # Decimal Degrees
-                    vert_angle_dd = float(vert_angle_str)
-                    azimuth_dd = float(azimuth_str)
-
-                # Calculate elevation difference
-                delta_elev = (horiz_dist * math.tan(math.radians(vert_angle_dd))) + inst_height - target_height
-                target_elev = inst_elev + delta_elev
-
-                # Calculate target coordinates
-                lat, dep = calculate_lat_dep([azimuth_dd], [horiz_dist])
-                target_north = inst_north + lat[0]
-                target_east = inst_east + dep[0]
-
-                # Populate results in the table
-                self.table.setItem(row, 5, QTableWidgetItem(f"{delta_elev:.4f}"))
-                self.table.setItem(row, 6, QTableWidgetItem(f"{target_north:.4f}"))
-                self.table.setItem(row, 7, QTableWidgetItem(f"{target_east:.4f}"))
-                self.table.setItem(row, 8, QTableWidgetItem(f"{target_elev:.4f}"))
-
-                # Store for exporting
-                self.final_points_3d.append((target_east, target_north, target_elev))
+            # Read each input column once, then stop at the first row with an empty input
+            dist_col, angle_col, target_h_col, azimuth_col = (self.read_column(col) for col in (1, 2, 3, 4))
+            n_rows = next((row for row, texts in enumerate(zip(dist_col, angle_col, target_h_col, azimuth_col))
+                           if not all(texts)), len(dist_col))
+
+            horiz_dist = np.array(dist_col[:n_rows], dtype=np.float64)
+            target_height = np.array(target_h_col[:n_rows], dtype=np.float64)
+            if angle_format == "DD.MMSS":
+                vert_angle_dd = dms_to_dd_array(angle_col[:n_rows])
+                azimuth_dd = dms_to_dd_array(azimuth_col[:n_rows])
+                if np.isnan(vert_angle_dd).any() or np.isnan(azimuth_dd).any():
+                    raise ValueError("An angle is not a valid DD.MMSS value.")
+            else: # Decimal Degrees
+                vert_angle_dd = np.array(angle_col[:n_rows], dtype=np.float64)
+                azimuth_dd = np.array(azimuth_col[:n_rows], dtype=np.float64)
+
+            # Elevation differences and target coordinates for all rows at once
+            delta_elev = horiz_dist * np.tan(np.radians(vert_angle_dd)) + inst_height - target_height
+            target_elev = inst_elev + delta_elev
+            lat, dep = calculate_lat_dep(azimuth_dd, horiz_dist)
+            target_north = inst_north + lat
+            target_east = inst_east + dep
+
+            # Show the results through the model, which resets once for all rows
+            self.result_columns = [np.char.mod("%.4f", values).tolist()
+                                   for values in (delta_elev, target_north, target_east, target_elev)]
+            self.results_model.update(zip(self.read_column(0)[:n_rows], *self.result_columns))
+
+            # Store for exporting
+            self.final_points_3d = list(zip(target_east.tolist(), target_north.tolist(), target_elev.tolist()))
 
             # Store summary for PDF report
             self.calculation_summary = {
@@ -216,9 +219,18 @@ class TrigLevelingTab(QWidget):
         except Exception as e:
             QMessageBox.critical(self, "Error", f"An unexpected error occurred: {e}")
 
+    def read_column(self, col):
+        """Returns the text of every cell in one table column ("" for empty cells)."""
+        texts = []
+        for row in range(self.table.rowCount()):
+            item = self.table.item(row, col)
+            texts.append(item.text() if item else "")
+        return texts
+
     def get_table_data_as_dataframe(self):
-        """Reads all data from the QTableWidget into a pandas DataFrame."""
+        """Reads the input table and the calculated results into one pandas DataFrame."""
         headers = [self.table.horizontalHeaderItem(i).text() for i in range(self.table.columnCount())]
+        results = self.result_columns or [[] for _ in RESULT_HEADERS]
         data = []
         for row in range(self.table.rowCount()):
             row_data = []
@@ -228,19 +240,21 @@ class TrigLevelingTab(QWidget):
             for col in range(self.table.columnCount()):
                 item = self.table.item(row, col)
                 row_data.append(item.text() if item and item.text() else "")
+            row_data.extend(column[row] if row < len(column) else "" for column in results)
             data.append(row_data)
-        return pd.DataFrame(data, columns=headers)
+        return pd.DataFrame(data, columns=headers + RESULT_HEADERS)
 
     def populate_table_from_dataframe(self, df):
         """Fills the table with data from a pandas DataFrame."""
         self.table.clearContents()
         self.table.setRowCount(len(df))
         headers = [self.table.horizontalHeaderItem(i).text() for i in range(self.table.columnCount())]
-        for row_idx, row_data in df.iterrows():
-            for col_idx, col_name in enumerate(headers):
-                if col_name in df.columns:
-                    item_data = str(row_data.get(col_name, ""))
-                    self.table.setItem(row_idx, col_idx, QTableWidgetItem(item_data))
+        # Table columns that exist in the CSV, read row by row as plain tuples
+        targets = [(col_idx, col_name) for col_idx, col_name in enumerate(headers) if col_name in df.columns]
+        rows = df[[col_name for _, col_name in targets]].itertuples(index=False, name=None)
+        for row_idx, row_data in enumerate(rows):
+            for (col_idx, _), value in zip(targets, row_data):
+                self.table.setItem(row_idx, col_idx, QTableWidgetItem(str(value)))
 
     def handle_import_csv(self):
         file_path, _ = QFileDialog.getOpenFileName(self, "Import CSV", "", "CSV Files (*.csv)")
@@ -248,6 +262,7 @@ class TrigLevelingTab(QWidget):
         df = import_csv_to_dataframe(file_path)
         if df is not None:
             self.populate_table_from_dataframe(df)
+            self.clear_results()
             QMessageBox.information(self, "Success", f"Successfully imported {len(df)} rows.")
         else:
             QMessageBox.critical(self, "Import Error", "Failed to read data from CSV file.")
@@ -307,20 +322,13 @@ class TrigLevelingTab(QWidget):
         if current_row >= 0: self.table.removeRow(current_row)
         else: QMessageBox.information(self, "Information", "Please select a row to remove.")
 
+    def clear_results(self):
+        self.result_columns = []
+        self.results_model.update([])
+
     def handle_clear(self):
         self.table.clearContents()
         self.table.setRowCount(10)
+        self.clear_results()
         self.calculation_summary = {}
         self.final_points_3d = []
-
-    def create_styled_button(self, text, bg_color, text_color="#FFFFFF"):
-        button = QPushButton(text)
-        button.setStyleSheet(f"""
-            QPushButton {{ background-color: {bg_color}; color: {text_color}; border-radius: 5px;
-                          padding: 10px; font-size: 14px; font-weight: bold; }}
-            QPushButton:hover {{ background-color: {self.darken_color(bg_color)}; }}""")
-        return button
-
-    def darken_color(self, color_str, factor=0.85):
-        color = QColor(color_str)
-        return color.darker(int(100 / factor)).name()
\ No newline at end of file